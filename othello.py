@@ -1,7 +1,27 @@
+import copy
+import os
+import random
 
 WHITE = 'W'
 BLACK = 'B'
 NONE = '-'
+BORDER = '#'
+
+DIRECTIONS = {'up':(0, 1), 'up_left':(-1, 1), 'up_right':(1, 1),
+              'down':(0, -1), 'down_left':(-1, -1), 'down_right':(1, -1),
+              'left':(-1, 0), 'right':(1, 0)}
+
+# Random keys for Zobrist hashing: one per (tile type, position) on the
+# largest 16x16 board, one for each board size, one for black to move and
+# one for the 'LEAST' win type.
+_zobrist_random = random.Random(20160601)
+_ZOBRIST_TILE_KEYS = {
+    WHITE: [_zobrist_random.getrandbits(64) for index in range(256)],
+    BLACK: [_zobrist_random.getrandbits(64) for index in range(256)]}
+_ZOBRIST_SIZE_KEYS = {(columns, rows): _zobrist_random.getrandbits(64)
+                      for columns in range(4, 17) for rows in range(4, 17)}
+_ZOBRIST_BLACK_TURN_KEY = _zobrist_random.getrandbits(64)
+_ZOBRIST_LEAST_KEY = _zobrist_random.getrandbits(64)
 
 class BoardSizeError(Exception):
     pass
@@ -21,7 +41,14 @@ class InvalidWinTypeError(Exception):
 class InvalidTileError(Exception):
     pass
 
+class CounterDriftError(Exception):
+    pass
+
 class OthelloGame:
+    # When True, get_score checks the tile counters against a full scan
+    # of the board. Set OTHELLO_CHECK_COUNTERS=1 to turn it on everywhere.
+    check_counters = os.environ.get('OTHELLO_CHECK_COUNTERS', '') not in ('', '0')
+
     def __init__(self, columns, rows, first_player: str, win_type: str,
                  center_tile: str):
         '''Creates an OthelloGame object with an empty board.'''
@@ -31,6 +58,21 @@ class OthelloGame:
         self._set_win_condition(win_type)
         self._set_center_tile(center_tile)
     
+    def __deepcopy__(self, memo: dict) -> 'OthelloGame':
+        '''Copies the game, sharing the ray and neighbour tables, which
+        only depend on the board size, instead of copying them.'''
+
+        game = self.__class__.__new__(self.__class__)
+        memo[id(self)] = game
+
+        for name, value in self.__dict__.items():
+            if name in ('_rays', '_neighbours'):
+                setattr(game, name, value)
+            else:
+                setattr(game, name, copy.deepcopy(value, memo))
+
+        return game
+
     def begin_game(self) -> None:
         '''Generates the starting state for an Othello game by placing
         the first for tiles, with the top left one specified by
@@ -63,38 +105,100 @@ class OthelloGame:
     def execute_move(self, move: tuple) -> None:
         '''Exceutes a move and then resets whose turn it is.'''
 
+        self.make_move(move)
+
+    def make_move(self, move: tuple) -> tuple:
+        '''Executes a move in the same way as execute_move and returns an
+        undo record which unmake_move can use to take the move back. The
+        record holds the position moved to, a list of the flipped tiles,
+        the player_turn before the move and the cached move tables.'''
+
         self.verify_move(move)
+        move_cache = self._move_cache
+        player_turn = self.player_turn
         move_set_list = self._get_move_set(move)
+        flipped_tiles = []
+        self._move_cache = {}
         self._place_tile(move, self.get_turn())
         for move_set in move_set_list:
-            self._flip_tiles(move_set)
+            flipped_tiles.extend(self._flip_tiles(move_set))
         self.player_turn = self.player_turn * -1
+        return (move, flipped_tiles, player_turn, move_cache)
+
+    def unmake_move(self, record: tuple) -> None:
+        '''Takes back the move described by an undo record from make_move,
+        restoring the board and whose turn it is.'''
+
+        move, flipped_tiles, player_turn, move_cache = record
+
+        if player_turn == 1:
+            flipped_type = BLACK
+        else:
+            flipped_type = WHITE
+
+        for tile in flipped_tiles:
+            self._place_tile(tile, flipped_type)
+        self._place_tile(move, NONE)
+        self.player_turn = player_turn
+        self._move_cache = move_cache
 
     def verify_move(self, move: tuple) -> None:
         '''Checks if a move is valid, raises an InvalidMoveError
         if the move is invalid, otherwise returns nothing.'''
 
-        possible_moves = self._return_possible_moves()
-        move_locs = []
-        
-        for move_origin_set in possible_moves:
-            move_locs.append(move_origin_set[0])
-
-        if move not in move_locs:
+        if move not in self._return_move_table():
             raise InvalidMoveError
 
+    def get_possible_moves(self) -> list:
+        '''Returns a list of the (column, row) positions the current
+        player can move to.'''
+
+        return list(self._return_move_table())
+
+    def get_flip_counts(self) -> dict:
+        '''Returns a dictionary mapping each possible move of the current
+        player to the number of tiles it would flip. Built from the
+        cached move table and cached along with it, so it is computed
+        once per position.'''
+
+        key = ('flip_counts', self.player_turn)
+        if key in self._move_cache:
+            return self._move_cache[key]
+
+        flip_counts = {}
+
+        for move, move_sets in self._return_move_table().items():
+            flip_count = 0
+            for move_set in move_sets:
+                origin = move_set[1]
+                flip_count += max(abs(origin[0] - move[0]),
+                                  abs(origin[1] - move[1])) - 1
+            flip_counts[move] = flip_count
+
+        self._move_cache[key] = flip_counts
+        return flip_counts
+
     def check_if_player_can_move(self) -> bool:
         '''Checks if a player has any vaid moves. If so, returns True.
         If not, skips to next players turn and returns False.'''
-        
-        possible_moves = self._return_possible_moves()
 
-        if len(possible_moves) == 0:
+        if len(self._return_move_table()) == 0:
             self.player_turn = self.player_turn * -1
             return False
         else:
             return True
 
+    def get_hash(self) -> int:
+        '''Returns a 64 bit Zobrist hash of the position, which includes
+        the board size, the tiles, whose turn it is and the win type.'''
+
+        position_hash = self._hash
+        if self.player_turn == -1:
+            position_hash ^= _ZOBRIST_BLACK_TURN_KEY
+        if self.win_condition == 'LEAST':
+            position_hash ^= _ZOBRIST_LEAST_KEY
+        return position_hash
+
     def check_if_game_over(self) -> bool:
         '''Checks if the game is over, either because the board is full
         or there are no possible moves for both players.'''
@@ -137,17 +241,15 @@ class OthelloGame:
     def get_score(self) -> tuple:
         '''Returns the score in a tuple. (WHITE, BLACK).'''
 
-        white_count = 0
-        black_count = 0
-        
-        for column in self.state:
-            for item in column:
-                if item == 'W':
-                    white_count += 1
-                if item == 'B':
-                    black_count += 1
+        if self.check_counters:
+            self._verify_counters()
+
+        return (self._counts[WHITE], self._counts[BLACK])
 
-        return (white_count, black_count)
+    def get_empty_count(self) -> int:
+        '''Returns the number of empty tiles on the board.'''
+
+        return self._counts[NONE]
             
     def _generate_game_board(self, columns, rows: int) -> None:
         '''Creates an othello game board with the specified number of
@@ -161,8 +263,19 @@ class OthelloGame:
             board.append([])
             for row in range(rows):
                 board[column].append(NONE)
-        
+
         self.state = board
+        self._padded_columns = columns + 2
+        self._cells = [BORDER] * ((columns + 2) * (rows + 2))
+        for column in range(1, columns + 1):
+            for row in range(1, rows + 1):
+                self._cells[self._return_index(column, row)] = NONE
+        self._rays = _return_ray_table(columns, rows)
+        self._neighbours = _return_neighbour_table(columns, rows)
+        self._frontier = {WHITE: {}, BLACK: {}}
+        self._move_cache = {}
+        self._hash = _ZOBRIST_SIZE_KEYS[(columns, rows)]
+        self._counts = {WHITE: 0, BLACK: 0, NONE: columns * rows}
 
     def _set_first_player(self, first_player: str) -> None:
         '''Verifies if the player entered is recognized as WHITE or BLACK and
@@ -220,30 +333,68 @@ class OthelloGame:
         the move will be made, the origin of the move, and the direction
         the move will be made in.'''
 
-        possible_moves = self._return_possible_moves()
-        move_list = []
-        for move_set in possible_moves:
-            if move == move_set[0]:
-                move_list.append(move_set)
-        return move_list
+        return list(self._return_move_table().get(move, []))
 
     def _place_tile(self, move: tuple, tile_type: str) -> None:
-        '''Places a tile in a specified position on the board.'''
+        '''Places a tile in a specified position on the board. Keeps the
+        frontier, hash and tile counters up to date and invalidates the
+        cached move tables.'''
 
         new_board = self.state
+        old_tile = new_board[move[0] - 1][move[1] - 1]
         new_board[move[0] - 1][move[1] - 1] = tile_type
         self.state = new_board
+        self._cells[self._return_index(move[0], move[1])] = tile_type
+        if self._move_cache:
+            self._move_cache = {}
+
+        if old_tile == tile_type:
+            return
+
+        self._counts[old_tile] -= 1
+        self._counts[tile_type] += 1
+
+        key_index = (move[0] - 1) * 16 + move[1] - 1
+        if old_tile != NONE:
+            self._hash ^= _ZOBRIST_TILE_KEYS[old_tile][key_index]
+        if tile_type != NONE:
+            self._hash ^= _ZOBRIST_TILE_KEYS[tile_type][key_index]
+
+        neighbours = self._neighbours[move]
+
+        for neighbour in neighbours:
+            if new_board[neighbour[0] - 1][neighbour[1] - 1] == NONE:
+                if old_tile != NONE:
+                    _decrement(self._frontier[old_tile], neighbour)
+                if tile_type != NONE:
+                    _increment(self._frontier[tile_type], neighbour)
+
+        if tile_type != NONE:
+            self._frontier[WHITE].pop(move, None)
+            self._frontier[BLACK].pop(move, None)
+        else:
+            for neighbour in neighbours:
+                neighbour_tile = new_board[neighbour[0] - 1][neighbour[1] - 1]
+                if neighbour_tile != NONE:
+                    _increment(self._frontier[neighbour_tile], move)
 
     def _return_tile(self, column: int, row: int) -> tuple:
         '''Checks if there is a tile in a specified position on the board.
         Returns the type of tile if their is a tile in the specified
         position, returns '-' otherwise.'''
 
-        try:
-            return self.state[column - 1][ row - 1]
-        except:
+        if (column < 1 or column > self._get_num_columns()
+            or row < 1 or row > self._get_num_rows()):
             raise OutsideBoardError()
 
+        return self.state[column - 1][row - 1]
+
+    def _return_index(self, column: int, row: int) -> int:
+        '''Returns the index of a position in the padded board, which
+        surrounds the game board with a ring of BORDER tiles.'''
+
+        return row * self._padded_columns + column
+
     def _find_center(self) -> tuple:
         '''Locates the top left position of the four slot center of the
         game board of an OthelloGame object and return the indexed position
@@ -255,6 +406,19 @@ class OthelloGame:
         return (int(columns/2), int(rows/2))
 
 
+    def _verify_counters(self) -> None:
+        '''Counts every tile on the board and raises a CounterDriftError
+        if the counts differ from the tile counters.'''
+
+        counts = {WHITE: 0, BLACK: 0, NONE: 0}
+
+        for column in self.state:
+            for item in column:
+                counts[item] += 1
+
+        if counts != self._counts:
+            raise CounterDriftError()
+
     def _return_tiles_with_state(self, param: 'what to count') -> list:
         '''Returns a list of tuple objects which contain the values which
         represent a position on the game board.'''
@@ -272,27 +436,38 @@ class OthelloGame:
 
         return empty_tiles
             
-    def _return_possible_moves(self) -> None:
-        '''Checks each tile from a list of empty tiles to see if it is a
-        possible move for  specified player. Returns a list of move_sets.
-        List will be empty if there are no possible moves.'''
-
-        directions = {'up':(0, 1), 'up_left':(-1, 1), 'up_right':(1, 1),
-                        'down':(0, -1), 'down_left':(-1, -1), 'down_right':(1, -1),
-                      'left':(-1, 0), 'right':(1, 0)}
-        empty_tiles = self._return_tiles_with_state(NONE)
-        occupied_tiles = (self._return_tiles_with_state(WHITE) +
-                          self._return_tiles_with_state(BLACK))
+    def _return_possible_moves(self) -> list:
+        '''Returns a list of move_sets for the current player. List will
+        be empty if there are no possible moves.'''
+
         possible_moves = []
 
-        for move in empty_tiles:
-            for direction in directions:
-                origin = self._check_direction(move, directions[direction])
-                if origin[0] != (-1, -1) and origin[0] in occupied_tiles:
-                    possible_moves.append((move, origin[0], origin[1]))
+        for move_sets in self._return_move_table().values():
+            possible_moves.extend(move_sets)
 
         return possible_moves
 
+    def _return_move_table(self) -> dict:
+        '''Returns a dictionary mapping each possible move of the current
+        player to its move_sets. Only empty tiles on the frontier next to
+        an opponent tile are checked, and the table is cached until the
+        board next changes, so it is computed once per position.'''
+
+        if self.player_turn in self._move_cache:
+            return self._move_cache[self.player_turn]
+
+        move_table = {}
+
+        for move in sorted(self._frontier[self._get_opposite_turn()]):
+            for direction in self._rays[move]:
+                origin = self._check_direction(move, direction)
+                if origin[0] != (-1, -1):
+                    move_table.setdefault(move, []).append(
+                        (move, origin[0], origin[1]))
+
+        self._move_cache[self.player_turn] = move_table
+        return move_table
+
 
     def _check_direction(self, move: tuple, direction: tuple) -> 'origin of move':
         '''Checks if a move if valid in a specified direction. If so,
@@ -302,44 +477,41 @@ class OthelloGame:
         direction and the direction which was checked.'''
 
         turn = self.get_turn()
+        opponent = self._get_opposite_turn()
+        cells = self._cells
+        ray = self._rays[move].get(direction)
         count = 0
 
-        while(True):
-            try:
-                tile = self._return_tile(move[0] + direction[0],
-                                    move[1] + direction[1])
-                if tile == turn or tile == NONE:
-                    break
-                else:
-                    move = (move[0] + direction[0], move[1] + direction[1])
-                    count += 1
-            except:
-                return ((-1, -1), direction)
-        try:
-            origin_tile = self._return_tile(move[0] + direction[0],
-                                           move[1] + direction[1])
-            if count > 0 and origin_tile == turn:
-                return ((move[0] + direction[0], move[1] + direction[1]), direction)
-            else:
-                raise OutsideBoardError()
-        except:
+        if ray is None:
             return ((-1, -1), direction)
+        positions, indexes = ray
 
-    def _flip_tiles(self, move_set: tuple) -> None:
-        '''Flips the tiles between two locations.'''
+        while cells[indexes[count]] == opponent:
+            count += 1
+
+        if count > 0 and cells[indexes[count]] == turn:
+            return (positions[count], direction)
+        else:
+            return ((-1, -1), direction)
+
+    def _flip_tiles(self, move_set: tuple) -> list:
+        '''Flips the tiles between two locations and returns a list of
+        the flipped positions.'''
 
         move = move_set[0]
         origin = move_set[1]
         direction = move_set[2]
         turn = self.get_turn()
+        flipped_tiles = []
 
-        while(True):
-            tile = (move[0] + direction[0], move[1] + direction[1])
+        for tile in self._rays[move][direction][0]:
             if tile == origin:
                 break
             else:
                 self._place_tile(tile, turn)
-                move = tile
+                flipped_tiles.append(tile)
+
+        return flipped_tiles
 
 
 #FUNCTIONS USED BY THE OTHELLO GAME CLASS:
@@ -359,6 +531,100 @@ def _verify_size(size: int) -> None:
     else:
         raise BoardSizeError
 
+_line_tables = {}
+_ray_tables = {}
+_neighbour_tables = {}
+
+def _return_line_table(columns: int, rows: int) -> dict:
+    '''Returns a dictionary mapping each position on the board to a
+    dictionary mapping each of the 8 DIRECTIONS, in order, to a tuple of
+    the positions from next to it up to the edge, which is empty at the
+    edge. The ray, neighbour and othello_eval tables are all built from
+    it. The table is built the first time a board size is used and
+    shared after that.'''
+
+    if (columns, rows) in _line_tables:
+        return _line_tables[(columns, rows)]
+
+    line_table = {}
+
+    for column in range(1, columns + 1):
+        for row in range(1, rows + 1):
+            lines = {}
+            for direction in DIRECTIONS.values():
+                positions = []
+                line_column = column + direction[0]
+                line_row = row + direction[1]
+                while 1 <= line_column <= columns and 1 <= line_row <= rows:
+                    positions.append((line_column, line_row))
+                    line_column += direction[0]
+                    line_row += direction[1]
+                lines[direction] = tuple(positions)
+            line_table[(column, row)] = lines
+
+    _line_tables[(columns, rows)] = line_table
+    return line_table
+
+def _return_ray_table(columns: int, rows: int) -> dict:
+    '''Returns a dictionary mapping each position on the board to a
+    dictionary of the rays leaving it. Each direction with at least two
+    positions before the edge maps to a tuple of the positions along the
+    ray and their indexes in the padded board, followed by the index of
+    the BORDER tile past the edge, so a walk along the indexes stops on
+    the sentinel without a bounds check. Rays which are too short to
+    flip anything are left out. The table is built the first time a
+    board size is used and shared by every game of that size.'''
+
+    if (columns, rows) in _ray_tables:
+        return _ray_tables[(columns, rows)]
+
+    ray_table = {}
+
+    for move, lines in _return_line_table(columns, rows).items():
+        rays = {}
+        for direction, positions in lines.items():
+            if len(positions) >= 2:
+                border = (positions[-1][0] + direction[0],
+                          positions[-1][1] + direction[1])
+                indexes = tuple(position[1] * (columns + 2) + position[0]
+                                for position in positions + (border,))
+                rays[direction] = (positions, indexes)
+        ray_table[move] = rays
+
+    _ray_tables[(columns, rows)] = ray_table
+    return ray_table
+
+def _return_neighbour_table(columns: int, rows: int) -> dict:
+    '''Returns a dictionary mapping each position on the board to a list
+    of the positions next to it which are also on the board, the first
+    position of each line. Shared by every game of the same size.'''
+
+    if (columns, rows) in _neighbour_tables:
+        return _neighbour_tables[(columns, rows)]
+
+    neighbour_table = {}
+
+    for move, lines in _return_line_table(columns, rows).items():
+        neighbour_table[move] = [positions[0] for positions in lines.values()
+                                 if len(positions) > 0]
+
+    _neighbour_tables[(columns, rows)] = neighbour_table
+    return neighbour_table
+
+def _increment(counts: dict, key) -> None:
+    '''Adds one to the count stored for key.'''
+
+    counts[key] = counts.get(key, 0) + 1
+
+def _decrement(counts: dict, key) -> None:
+    '''Subtracts one from the count stored for key, removing the key
+    once its count reaches zero.'''
+
+    if counts[key] == 1:
+        del counts[key]
+    else:
+        counts[key] -= 1
+
 def _return_highest_count(white_count:int, black_count: int) -> str:
     '''Returns whose count is higher, WHITE or BLACK.'''
 
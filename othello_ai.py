@@ -0,0 +1,280 @@
+import random
+import time
+import othello
+import othello_eval
+import othello_transposition
+
+WIN_SCORE = 100000
+
+# The search checks its deadline and stop event every CHECK_INTERVAL
+# nodes, a power of two. The engine searches a few thousand nodes a
+# second, so this keeps the overshoot to a few milliseconds.
+CHECK_INTERVAL = 32
+
+class SearchTimeout(Exception):
+    pass
+
+class RandomPlayer:
+    '''Computer player which chooses one of its possible moves at random.'''
+
+    def __init__(self, seed: int = None):
+        '''Creates a RandomPlayer whose choices are repeatable for a
+        given seed.'''
+
+        self._random = random.Random(seed)
+
+    def choose_move(self, game: othello.OthelloGame) -> tuple:
+        '''Returns a random possible move for the current player of game,
+        or None if the current player has no possible moves.'''
+
+        moves = sorted(game.get_possible_moves())
+
+        if len(moves) == 0:
+            return None
+        return self._random.choice(moves)
+
+class GreedyPlayer:
+    '''Computer player which chooses the move that flips the most tiles,
+    or the fewest when the win type is 'LEAST'. Ties are broken at
+    random.'''
+
+    def __init__(self, seed: int = None):
+        '''Creates a GreedyPlayer whose tie breaks are repeatable for a
+        given seed.'''
+
+        self._random = random.Random(seed)
+
+    def choose_move(self, game: othello.OthelloGame) -> tuple:
+        '''Returns the greedy move for the current player of game, or None
+        if the current player has no possible moves.'''
+
+        best_moves = []
+        best_count = None
+
+        for move in sorted(game.get_possible_moves()):
+            record = game.make_move(move)
+            game.unmake_move(record)
+            flip_count = len(record[1])
+            if game.win_condition == 'LEAST':
+                flip_count = -flip_count
+            if best_count is None or flip_count > best_count:
+                best_moves = [move]
+                best_count = flip_count
+            elif flip_count == best_count:
+                best_moves.append(move)
+
+        if len(best_moves) == 0:
+            return None
+        return self._random.choice(best_moves)
+
+class AlphaBetaPlayer:
+    '''Computer player which chooses moves for an othello.OthelloGame using
+    a negamax search with alpha-beta pruning and iterative deepening,
+    stopping when its time budget for the move runs out.'''
+
+    def __init__(self, time_limit: float = 1.0, max_depth: int = 64,
+                 transposition_table: 'TranspositionTable' = None,
+                 opening_book: 'OpeningBook' = None):
+        '''Creates an AlphaBetaPlayer which spends at most time_limit seconds
+        and searches at most max_depth moves ahead on each move. A
+        transposition table may be passed in to share it between players
+        and searches, otherwise the player creates its own. If an
+        othello_book.OpeningBook is given, book moves are played without
+        searching.'''
+
+        if transposition_table is None:
+            transposition_table = othello_transposition.TranspositionTable()
+
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.transposition_table = transposition_table
+        self.opening_book = opening_book
+        self.nodes = 0
+        self.depth_reached = 0
+        self.best_score = 0
+
+    def choose_move(self, game: othello.OthelloGame,
+                    on_depth: 'function' = None,
+                    stop_event: 'threading.Event' = None) -> tuple:
+        '''Returns the best move found for the current player of game, or
+        None if the current player has no possible moves. The game is
+        left in the same state it was passed in. If on_depth is given it
+        is called with a dictionary of the best move, score, depth and
+        node count each time a depth is finished. If stop_event is given
+        the search stops early once it is set.'''
+
+        moves = game.get_possible_moves()
+        self._stop_event = stop_event
+        self.nodes = 0
+        self.depth_reached = 0
+        self.best_score = 0
+
+        if len(moves) == 0:
+            return None
+
+        if self.opening_book is not None:
+            book_move = self.opening_book.choose_move(game)
+            if book_move in moves:
+                return book_move
+
+        self._deadline = time.perf_counter() + self.time_limit
+        self.transposition_table.new_search()
+        self._weights = othello_eval.get_geometry(game._get_num_columns(),
+            game._get_num_rows()).weight_table
+        best_move = self._order_moves(moves)[0]
+        empty_count = game.get_empty_count()
+
+        for depth in range(1, min(self.max_depth, empty_count) + 1):
+            try:
+                best_move, self.best_score = self._search_root(
+                    game, moves, depth, best_move)
+            except SearchTimeout:
+                break
+            self.depth_reached = depth
+            if on_depth is not None:
+                on_depth({'move': best_move, 'score': self.best_score,
+                          'depth': depth, 'nodes': self.nodes})
+            if abs(self.best_score) >= WIN_SCORE:
+                break
+
+        return best_move
+
+    def _search_root(self, game: othello.OthelloGame, moves: list,
+                     depth: int, best_move: tuple) -> tuple:
+        '''Searches every root move to depth, trying the best move from
+        the previous iteration first. Returns (best move, score).'''
+
+        ordered_moves = [best_move]
+        for move in self._order_moves(moves):
+            if move != best_move:
+                ordered_moves.append(move)
+
+        alpha = -WIN_SCORE * 2
+        beta = WIN_SCORE * 2
+
+        for move in ordered_moves:
+            self._check_stop()
+            record = game.make_move(move)
+            try:
+                score = -self._negamax(game, depth - 1, -beta, -alpha, False)
+            finally:
+                game.unmake_move(record)
+            if score > alpha:
+                alpha = score
+                best_move = move
+
+        self.transposition_table.store(game.get_hash(), depth,
+            othello_transposition.EXACT, alpha, best_move)
+
+        return (best_move, alpha)
+
+    def _negamax(self, game: othello.OthelloGame, depth: int, alpha: int,
+                 beta: int, passed: bool) -> int:
+        '''Returns the score of the game from the current player's point of
+        view. passed is True if the previous player had to pass.'''
+
+        self.nodes += 1
+        if self.nodes & (CHECK_INTERVAL - 1) == 0:
+            self._check_stop()
+
+        position_hash = game.get_hash()
+        entry = self.transposition_table.lookup(position_hash)
+        table_move = None
+
+        if entry is not None:
+            entry_depth, bound, score, table_move = entry[1:5]
+            if entry_depth >= depth:
+                if bound == othello_transposition.EXACT:
+                    return score
+                if bound == othello_transposition.LOWER_BOUND and score >= beta:
+                    return score
+                if bound == othello_transposition.UPPER_BOUND and score <= alpha:
+                    return score
+
+        moves = game.get_possible_moves()
+
+        if len(moves) == 0:
+            if passed:
+                return _return_final_score(game)
+            game.player_turn = game.player_turn * -1
+            try:
+                return -self._negamax(game, depth, -beta, -alpha, True)
+            finally:
+                game.player_turn = game.player_turn * -1
+
+        if depth == 0:
+            return othello_eval.evaluate(game)
+
+        ordered_moves = self._order_moves(moves)
+        if table_move in moves:
+            ordered_moves.remove(table_move)
+            ordered_moves.insert(0, table_move)
+
+        original_alpha = alpha
+        best_score = -WIN_SCORE * 2
+        best_move = None
+
+        for move in ordered_moves:
+            record = game.make_move(move)
+            try:
+                score = -self._negamax(game, depth - 1, -beta, -alpha, False)
+            finally:
+                game.unmake_move(record)
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            bound = othello_transposition.UPPER_BOUND
+        elif best_score >= beta:
+            bound = othello_transposition.LOWER_BOUND
+        else:
+            bound = othello_transposition.EXACT
+        self.transposition_table.store(position_hash, depth, bound,
+                                       best_score, best_move)
+
+        return best_score
+
+    def _check_stop(self) -> None:
+        '''Raises a SearchTimeout if the deadline has passed or the stop
+        event is set.'''
+
+        if time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        if self._stop_event is not None and self._stop_event.is_set():
+            raise SearchTimeout()
+
+    def _order_moves(self, moves: list) -> list:
+        '''Returns the moves sorted so that the most promising squares,
+        such as corners, are searched first.'''
+
+        weights = self._weights
+        return sorted(moves, key = lambda move: -weights[move])
+
+
+#FUNCTIONS USED BY THE ALPHA BETA PLAYER:
+
+def _return_final_score(game: othello.OthelloGame) -> int:
+    '''Returns the score of a finished game from the current player's
+    point of view. Wins score above WIN_SCORE and losses below -WIN_SCORE,
+    by the margin of discs, under the game's win condition.'''
+
+    white_count, black_count = game.get_score()
+
+    if game.player_turn == 1:
+        difference = white_count - black_count
+    else:
+        difference = black_count - white_count
+
+    if game.win_condition == 'LEAST':
+        difference = -difference
+
+    if difference > 0:
+        return WIN_SCORE + difference
+    if difference < 0:
+        return -WIN_SCORE + difference
+    return 0
@@ -0,0 +1,362 @@
+import argparse
+import time
+import numpy as np
+import othello
+
+# Values of the board array. They match player_turn, which is 1 when it
+# is WHITE's turn and -1 when it is BLACK's.
+TILE_VALUES = {othello.WHITE: 1, othello.BLACK: -1, othello.NONE: 0}
+VALUE_TILES = {1: othello.WHITE, -1: othello.BLACK, 0: othello.NONE}
+
+class BatchMismatchError(Exception):
+    pass
+
+class BatchOthelloGames:
+    '''Many Othello games of the same size and settings played in
+    lockstep. The boards are one int8 NumPy array of shape
+    (games, columns, rows) indexed like OthelloGame.state, holding 1 for
+    WHITE, -1 for BLACK and 0 for empty, and player_turn is an int8 array
+    with the turn of each game. Move masks, moves and scores are computed
+    for every game at once. Moves are (column, row) pairs as in
+    OthelloGame, with (0, 0) meaning the game does not move. Change the
+    boards through the methods, or with set_game, so the cached move
+    masks are cleared.'''
+
+    def __init__(self, game_count: int, columns: int, rows: int,
+                 first_player: str, win_type: str, center_tile: str):
+        '''Creates game_count games with empty boards, with the same
+        settings as an othello.OthelloGame.'''
+
+        othello._verify_board_size(columns, rows)
+        if first_player == 'WHITE':
+            turn = 1
+        elif first_player == 'BLACK':
+            turn = -1
+        else:
+            raise othello.InvalidPlayerError()
+        if win_type not in ('MOST', 'LEAST'):
+            raise othello.InvalidWinTypeError()
+        if center_tile not in ('WHITE', 'BLACK'):
+            raise othello.InvalidTileError()
+
+        self.columns = columns
+        self.rows = rows
+        self.win_condition = win_type
+        self.center_tile = center_tile
+        self.boards = np.zeros((game_count, columns, rows), dtype = np.int8)
+        self.player_turn = np.full(game_count, turn, dtype = np.int8)
+        self._mask_cache = None
+
+    @classmethod
+    def from_games(cls, games: list) -> 'BatchOthelloGames':
+        '''Returns a batch holding copies of the positions of a list of
+        othello.OthelloGames, which must all have the same board size and
+        win type.'''
+
+        columns = games[0]._get_num_columns()
+        rows = games[0]._get_num_rows()
+        batch = cls(len(games), columns, rows, 'WHITE',
+                    games[0].win_condition, 'WHITE')
+
+        for index, game in enumerate(games):
+            if (game._get_num_columns() != columns or game._get_num_rows() != rows
+                or game.win_condition != batch.win_condition):
+                raise othello.BoardSizeError()
+            batch.set_game(index, game)
+
+        return batch
+
+    def __len__(self) -> int:
+        '''Returns the number of games in the batch.'''
+
+        return len(self.boards)
+
+    def begin_game(self) -> None:
+        '''Places the four center tiles of every game, in the same way as
+        OthelloGame.begin_game.'''
+
+        column = int(self.columns/2) - 1
+        row = int(self.rows/2) - 1
+        if self.center_tile == 'WHITE':
+            center = 1
+        else:
+            center = -1
+
+        self.boards[:, column, row] = center
+        self.boards[:, column, row + 1] = -center
+        self.boards[:, column + 1, row] = -center
+        self.boards[:, column + 1, row + 1] = center
+        self._mask_cache = None
+
+    def get_move_masks(self) -> np.ndarray:
+        '''Returns a bool array of shape (games, columns, rows) which is
+        True where the current player of each game can move. The masks
+        are kept until the boards or turns change, so asking again for
+        the same position is free.'''
+
+        if (self._mask_cache is not None
+            and np.array_equal(self._mask_cache[0], self.player_turn)):
+            return self._mask_cache[1]
+
+        turn = self.player_turn[:, None, None]
+        player = self.boards == turn
+        opponent = self.boards == -turn
+        empty = self.boards == 0
+        moves = np.zeros_like(empty)
+
+        for direction in othello.DIRECTIONS.values():
+            run = _shift(player, direction) & opponent
+            while True:
+                extended = run | (_shift(run, direction) & opponent)
+                if np.array_equal(extended, run):
+                    break
+                run = extended
+            moves |= _shift(run, direction) & empty
+
+        self._mask_cache = (self.player_turn.copy(), moves)
+        return moves
+
+    def make_moves(self, moves: np.ndarray) -> np.ndarray:
+        '''Makes one move in every game, given an int array of shape
+        (games, 2) of (column, row) moves, and returns a bool array of the
+        tiles each move flipped. Games given (0, 0) are left as they are.
+        Raises an othello.InvalidMoveError if any other move is not
+        allowed.'''
+
+        moves = np.asarray(moves)
+        moving = np.nonzero(moves[:, 0] > 0)[0]
+        columns = moves[moving, 0] - 1
+        rows = moves[moving, 1] - 1
+
+        if (np.any(columns >= self.columns) or np.any(rows >= self.rows)
+            or np.any(rows < 0)):
+            raise othello.InvalidMoveError()
+        if not np.all(self.get_move_masks()[moving, columns, rows]):
+            raise othello.InvalidMoveError()
+
+        placed = np.zeros(self.boards.shape, dtype = bool)
+        placed[moving, columns, rows] = True
+        turn = self.player_turn[:, None, None]
+        player = self.boards == turn
+        opponent = self.boards == -turn
+        flips = np.zeros_like(placed)
+
+        for direction in othello.DIRECTIONS.values():
+            line = np.zeros_like(placed)
+            captured = np.zeros(len(self.boards), dtype = bool)
+            step = _shift(placed, direction)
+            while True:
+                captured |= (step & player).any(axis = (1, 2))
+                step &= opponent
+                if not step.any():
+                    break
+                line |= step
+                step = _shift(step, direction)
+            flips |= line & captured[:, None, None]
+
+        self.boards = np.where(placed | flips, turn, self.boards)
+        self.player_turn[moving] *= -1
+        self._mask_cache = None
+
+        return flips
+
+    def check_if_players_can_move(self) -> np.ndarray:
+        '''Returns a bool array which is True for the games where the
+        current player can move. In the other games the turn passes to
+        the other player, as in OthelloGame.check_if_player_can_move.'''
+
+        can_move = self.get_move_masks().any(axis = (1, 2))
+        self.player_turn[~can_move] *= -1
+        return can_move
+
+    def check_if_games_over(self) -> np.ndarray:
+        '''Returns a bool array which is True for the games where neither
+        player can move, changing turns in the same way as
+        OthelloGame.check_if_game_over.'''
+
+        passed = ~self.check_if_players_can_move()
+        over = np.zeros(len(self.boards), dtype = bool)
+
+        if passed.any():
+            over = passed & ~self.get_move_masks().any(axis = (1, 2))
+            self.player_turn[over] *= -1
+
+        return over
+
+    def get_scores(self) -> tuple:
+        '''Returns (white counts, black counts) as int arrays.'''
+
+        return ((self.boards == 1).sum(axis = (1, 2)),
+                (self.boards == -1).sum(axis = (1, 2)))
+
+    def return_winners(self) -> np.ndarray:
+        '''Returns an int8 array with the winner of each game in its
+        current state: 1 for WHITE, -1 for BLACK and 0 for a tie.'''
+
+        white_counts, black_counts = self.get_scores()
+        winners = np.sign(white_counts - black_counts).astype(np.int8)
+        if self.win_condition == 'LEAST':
+            winners = -winners
+        return winners
+
+    def choose_random_moves(self, rng: np.random.Generator) -> np.ndarray:
+        '''Returns an int array of shape (games, 2) with a random possible
+        move for the current player of each game, or (0, 0) for games
+        where they have no possible moves.'''
+
+        masks = self.get_move_masks().reshape(len(self.boards), -1)
+        choices = (rng.random(masks.shape) * masks).argmax(axis = 1)
+        moves = np.stack([choices // self.rows + 1, choices % self.rows + 1],
+                         axis = 1)
+        moves[~masks.any(axis = 1)] = 0
+        return moves
+
+    def set_game(self, index: int, game: othello.OthelloGame) -> None:
+        '''Copies the position of an othello.OthelloGame into the game at
+        index.'''
+
+        self.boards[index] = [[TILE_VALUES[tile] for tile in column]
+                              for column in game.state]
+        self.player_turn[index] = game.player_turn
+        self._mask_cache = None
+
+    def to_game(self, index: int) -> othello.OthelloGame:
+        '''Returns an othello.OthelloGame with the position of the game at
+        index.'''
+
+        game = othello.OthelloGame(self.columns, self.rows, 'WHITE',
+                                   self.win_condition, self.center_tile)
+
+        for column, row in zip(*np.nonzero(self.boards[index])):
+            game._place_tile((int(column) + 1, int(row) + 1),
+                             VALUE_TILES[int(self.boards[index, column, row])])
+        game.player_turn = int(self.player_turn[index])
+
+        return game
+
+def play_random_games(game_count: int, columns: int, rows: int,
+                      seed: int = 0, win_type: str = 'MOST') -> BatchOthelloGames:
+    '''Plays game_count random games in lockstep from the begin_game
+    position, with BLACK moving first, and returns the finished batch.'''
+
+    rng = np.random.default_rng(seed)
+    batch = BatchOthelloGames(game_count, columns, rows, 'BLACK', win_type,
+                              'WHITE')
+    batch.begin_game()
+
+    while True:
+        over = batch.check_if_games_over()
+        if over.all():
+            return batch
+        moves = batch.choose_random_moves(rng)
+        moves[over] = 0
+        batch.make_moves(moves)
+
+def check_batch(game_count: int, columns: int, rows: int,
+                seed: int = 0) -> None:
+    '''Plays random games in lockstep and checks every position of every
+    game against othello.OthelloGame: the board, the turn, the possible
+    moves, the flipped tiles and the final scores. Raises a
+    BatchMismatchError describing the first difference.'''
+
+    rng = np.random.default_rng(seed)
+    batch = BatchOthelloGames(game_count, columns, rows, 'BLACK', 'MOST',
+                              'WHITE')
+    batch.begin_game()
+    games = [batch.to_game(index) for index in range(game_count)]
+
+    while True:
+        over = batch.check_if_games_over()
+        for index, game in enumerate(games):
+            if game.check_if_game_over() != over[index]:
+                raise BatchMismatchError('game {}: game over differs'.format(index))
+            if game.player_turn != batch.player_turn[index]:
+                raise BatchMismatchError('game {}: turn differs'.format(index))
+        if over.all():
+            break
+
+        masks = batch.get_move_masks()
+        moves = batch.choose_random_moves(rng)
+        moves[over] = 0
+        for index, game in enumerate(games):
+            expected = set(game.get_possible_moves())
+            found = {(int(column) + 1, int(row) + 1)
+                     for column, row in zip(*np.nonzero(masks[index]))}
+            if not over[index] and found != expected:
+                raise BatchMismatchError('game {}: possible moves differ'.format(index))
+
+        flips = batch.make_moves(moves)
+        for index, game in enumerate(games):
+            if over[index]:
+                continue
+            record = game.make_move(tuple(int(value) for value in moves[index]))
+            found = {(int(column) + 1, int(row) + 1)
+                     for column, row in zip(*np.nonzero(flips[index]))}
+            if found != set(record[1]):
+                raise BatchMismatchError('game {}: flips differ'.format(index))
+            if batch.to_game(index).state != game.state:
+                raise BatchMismatchError('game {}: board differs'.format(index))
+
+    white_counts, black_counts = batch.get_scores()
+    for index, game in enumerate(games):
+        if game.get_score() != (white_counts[index], black_counts[index]):
+            raise BatchMismatchError('game {}: score differs'.format(index))
+
+def main(arguments: list = None) -> None:
+    '''Checks the batch engine against othello.OthelloGame and then times
+    random games played in lockstep against one game at a time.'''
+
+    parser = argparse.ArgumentParser(
+        description = 'Plays random Othello games in lockstep with NumPy.')
+    parser.add_argument('--games', type = int, default = 1000)
+    parser.add_argument('--columns', type = int, default = 8)
+    parser.add_argument('--rows', type = int, default = 8)
+    parser.add_argument('--seed', type = int, default = 0)
+    args = parser.parse_args(arguments)
+
+    check_batch(20, args.columns, args.rows, args.seed)
+    print('batch engine matches othello.OthelloGame')
+
+    start = time.perf_counter()
+    batch = play_random_games(args.games, args.columns, args.rows, args.seed)
+    elapsed = time.perf_counter() - start
+    print('batch: {} games in {:.2f}s ({:.1f} games/sec)'.format(
+        len(batch), elapsed, len(batch) / elapsed))
+
+    rng = np.random.default_rng(args.seed)
+    game_count = max(args.games // 10, 1)
+    start = time.perf_counter()
+    for count in range(game_count):
+        game = othello.OthelloGame(args.columns, args.rows, 'BLACK', 'MOST',
+                                   'WHITE')
+        game.begin_game()
+        while not game.check_if_game_over():
+            moves = sorted(game.get_possible_moves())
+            game.execute_move(moves[rng.integers(len(moves))])
+    elapsed = time.perf_counter() - start
+    print('one at a time: {} games in {:.2f}s ({:.1f} games/sec)'.format(
+        game_count, elapsed, game_count / elapsed))
+
+
+#FUNCTIONS USED BY THE BATCH ENGINE:
+
+def _shift(boards: np.ndarray, direction: tuple) -> np.ndarray:
+    '''Returns a copy of a (games, columns, rows) array with every board
+    moved one square in direction, filling the squares left behind with
+    zeros.'''
+
+    column_step, row_step = direction
+    columns = boards.shape[1]
+    rows = boards.shape[2]
+    shifted = np.zeros_like(boards)
+
+    shifted[:, max(column_step, 0):columns + min(column_step, 0),
+            max(row_step, 0):rows + min(row_step, 0)] = boards[
+        :, max(-column_step, 0):columns - max(column_step, 0),
+        max(-row_step, 0):rows - max(row_step, 0)]
+
+    return shifted
+
+if __name__ == '__main__':
+
+    main()
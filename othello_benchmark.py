@@ -0,0 +1,310 @@
+import copy
+import random
+import time
+import othello
+import othello_ai
+import othello_bitboard
+import othello_endgame
+import othello_position
+import othello_symmetry
+
+BOARD_SIZES = [(8, 8), (16, 16)]
+
+# (columns, rows, win type, number of random moves from begin_game)
+STANDARD_POSITIONS = [(8, 8, 'MOST', 0), (8, 8, 'MOST', 20),
+                      (8, 8, 'LEAST', 20), (8, 8, 'MOST', 44),
+                      (6, 6, 'MOST', 10), (16, 16, 'MOST', 60)]
+
+# Board sizes for the canonicalisation benchmark, square and rectangular.
+SYMMETRY_SIZES = [(8, 8), (16, 16), (8, 12)]
+
+# (columns, rows, win type, number of empty squares left)
+ENDGAME_POSITIONS = [(8, 8, 'MOST', 12), (8, 8, 'LEAST', 12),
+                     (8, 8, 'MOST', 14), (6, 6, 'MOST', 16)]
+
+def play_random_positions(game_class, columns: int, rows: int,
+                          seed: int = 0) -> list:
+    '''Plays a random game from the begin_game position and returns a
+    list with a copy of the game for every position reached, so the
+    positions can be timed later.'''
+
+    rng = random.Random(seed)
+    positions = []
+    game = game_class(columns, rows, 'BLACK', 'MOST', 'WHITE')
+    game.begin_game()
+
+    while not game.check_if_game_over():
+        positions.append(copy.deepcopy(game))
+        game.execute_move(rng.choice(sorted(game.get_possible_moves())))
+
+    return positions
+
+def benchmark_move_generation(repeat: int = 20) -> None:
+    '''Times full move generation over every position of a random game
+    on 8x8 and 16x16 boards, for both the list and bitboard engines.'''
+
+    for columns, rows in BOARD_SIZES:
+        list_positions = play_random_positions(othello.OthelloGame,
+                                               columns, rows)
+        bit_positions = play_random_positions(
+            othello_bitboard.BitboardOthelloGame, columns, rows)
+
+        start = time.perf_counter()
+        for count in range(repeat):
+            for game in list_positions:
+                game._move_cache.clear()
+                game._return_possible_moves()
+        list_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for count in range(repeat):
+            for game in bit_positions:
+                game._return_move_mask()
+        bit_time = time.perf_counter() - start
+
+        generations = repeat * len(list_positions)
+        print('{}x{}: {} positions'.format(columns, rows, len(list_positions)))
+        print('  list engine:     {:10.1f} us per generation'.format(
+            list_time / generations * 1000000))
+        print('  bitboard engine: {:10.1f} us per generation'.format(
+            bit_time / generations * 1000000))
+
+def benchmark_ray_walk(repeat: int = 20) -> None:
+    '''Times the engine's own move generation, OthelloGame._return_move_table
+    with its cache cleared, which walks the padded board until a BORDER
+    tile, against the original _return_possible_moves, which walks
+    OthelloGame.state and relies on exceptions to stop at the edge, over
+    every position of a random game on 8x8 and 16x16 boards. The
+    engine also only checks the empty tiles on its frontier, so the
+    difference includes that as well as the walk.'''
+
+    for columns, rows in BOARD_SIZES:
+        games = play_random_positions(othello.OthelloGame, columns, rows)
+
+        for game in games:
+            game._move_cache.clear()
+            engine_sets = [move_set for move_sets in
+                           game._return_move_table().values()
+                           for move_set in move_sets]
+            if sorted(engine_sets) != sorted(_return_moves_by_exceptions(game)):
+                raise AssertionError('the move generators find different moves')
+
+        start = time.perf_counter()
+        for count in range(repeat):
+            for game in games:
+                _return_moves_by_exceptions(game)
+        exception_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for count in range(repeat):
+            for game in games:
+                game._move_cache.clear()
+                game._return_move_table()
+        engine_time = time.perf_counter() - start
+
+        generations = repeat * len(games)
+        print('{}x{}: {} positions'.format(columns, rows, len(games)))
+        print('  original exception walk: {:10.1f} us per generation'.format(
+            exception_time / generations * 1000000))
+        print('  engine sentinel walk:    {:10.1f} us per generation ({:.2f}x)'.format(
+            engine_time / generations * 1000000,
+            exception_time / engine_time))
+
+def return_standard_position(columns: int, rows: int, win_type: str,
+                             random_moves: int) -> othello.OthelloGame:
+    '''Returns the game reached by playing random_moves random moves
+    from the begin_game position with a fixed seed.'''
+
+    rng = random.Random(random_moves)
+    game = othello.OthelloGame(columns, rows, 'BLACK', win_type, 'WHITE')
+    game.begin_game()
+
+    for count in range(random_moves):
+        if game.check_if_game_over():
+            break
+        game.execute_move(rng.choice(sorted(game.get_possible_moves())))
+
+    return game
+
+def benchmark_search(time_limit: float = 2.0) -> None:
+    '''Reports the nodes per second of othello_ai.AlphaBetaPlayer on each
+    of the standard positions.'''
+
+    for columns, rows, win_type, random_moves in STANDARD_POSITIONS:
+        game = return_standard_position(columns, rows, win_type, random_moves)
+        player = othello_ai.AlphaBetaPlayer(time_limit)
+
+        start = time.perf_counter()
+        move = player.choose_move(game)
+        elapsed = time.perf_counter() - start
+
+        print('{}x{} {} +{}: move {} depth {} nodes {} ({:.0f} nodes/sec)'.format(
+            columns, rows, win_type, random_moves, move,
+            player.depth_reached, player.nodes, player.nodes / elapsed))
+
+        table_stats = player.transposition_table.get_stats()
+        print('  transposition table: {:.1%} hit rate, {} of {} slots, {} bytes'.format(
+            table_stats['hit_rate'], table_stats['used'], table_stats['size'],
+            table_stats['memory_bytes']))
+
+def benchmark_endgame() -> None:
+    '''Reports the nodes and solve time of othello_endgame.EndgameSolver
+    on each of the endgame positions.'''
+
+    for columns, rows, win_type, empties in ENDGAME_POSITIONS:
+        game = return_standard_position(columns, rows, win_type,
+                                        columns * rows - 4 - empties)
+        result = othello_endgame.EndgameSolver().solve(game)
+
+        print('{}x{} {} {} empties: move {} score {} nodes {} in {:.2f}s ({:.0f} nodes/sec)'.format(
+            columns, rows, win_type, game.get_empty_count(), result['move'],
+            result['score'], result['nodes'], result['seconds'],
+            result['nodes'] / result['seconds']))
+
+def benchmark_cloning(repeat: int = 20) -> None:
+    '''Times copying every position of a random game as a deep copy of an
+    OthelloGame, as a conversion to an othello_position.Position and as
+    a Position clone.'''
+
+    for columns, rows in BOARD_SIZES:
+        games = play_random_positions(othello.OthelloGame, columns, rows)
+        positions = [othello_position.Position.from_game(game) for game in games]
+
+        start = time.perf_counter()
+        for game in games:
+            copy.deepcopy(game)
+        deepcopy_time = (time.perf_counter() - start) / len(games)
+
+        start = time.perf_counter()
+        for count in range(repeat):
+            for game in games:
+                othello_position.Position.from_game(game)
+        convert_time = (time.perf_counter() - start) / (repeat * len(games))
+
+        start = time.perf_counter()
+        for count in range(repeat):
+            for position in positions:
+                position.clone()
+        clone_time = (time.perf_counter() - start) / (repeat * len(games))
+
+        print('{}x{}:'.format(columns, rows))
+        print('  OthelloGame deepcopy: {:10.2f} us'.format(deepcopy_time * 1000000))
+        print('  Position.from_game:   {:10.2f} us'.format(convert_time * 1000000))
+        print('  Position.clone:       {:10.2f} us'.format(clone_time * 1000000))
+
+def benchmark_canonicalisation(repeat: int = 5) -> None:
+    '''Times othello_symmetry canonicalisation of every position of a
+    random game, from both the OthelloGame.state and the packed form.'''
+
+    for columns, rows in SYMMETRY_SIZES:
+        states = [game.state for game in
+                  play_random_positions(othello.OthelloGame, columns, rows)]
+        packed_states = [othello_symmetry.pack_state(state) for state in states]
+
+        start = time.perf_counter()
+        for count in range(repeat):
+            for state in states:
+                othello_symmetry.canonicalise(state)
+        state_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for count in range(repeat):
+            for packed in packed_states:
+                othello_symmetry.canonicalise_packed(packed, columns, rows)
+        packed_time = time.perf_counter() - start
+
+        positions = repeat * len(states)
+        print('{}x{}: {} symmetries'.format(columns, rows,
+            len(othello_symmetry.get_transforms(columns, rows))))
+        print('  state form:  {:10.0f} positions/sec'.format(
+            positions / state_time))
+        print('  packed form: {:10.0f} positions/sec'.format(
+            positions / packed_time))
+
+
+#FUNCTIONS USED BY THE BENCHMARKS:
+
+def _return_moves_by_exceptions(game: othello.OthelloGame) -> list:
+    '''Returns the move_sets of the current player of game in the same
+    way as the original OthelloGame._return_possible_moves: every empty
+    tile is checked in every direction by stepping over game.state until
+    a lookup off the board raises.'''
+
+    state = game.state
+    empty_tiles = _return_tiles_with_state(state, othello.NONE)
+    occupied_tiles = (_return_tiles_with_state(state, othello.WHITE)
+                      + _return_tiles_with_state(state, othello.BLACK))
+    turn = game.get_turn()
+    possible_moves = []
+
+    for move in empty_tiles:
+        for direction in othello.DIRECTIONS.values():
+            origin = _check_direction_by_exceptions(state, turn, move, direction)
+            if origin[0] != (-1, -1) and origin[0] in occupied_tiles:
+                possible_moves.append((move, origin[0], origin[1]))
+
+    return possible_moves
+
+def _return_tiles_with_state(state: list, tile_type: str) -> list:
+    '''Returns the positions of state holding tile_type, as the original
+    OthelloGame._return_tiles_with_state did.'''
+
+    tiles = []
+
+    for column in range(1, len(state) + 1):
+        for row in range(1, len(state[0]) + 1):
+            if _return_tile_or_raise(state, column, row) == tile_type:
+                tiles.append((column, row))
+
+    return tiles
+
+def _check_direction_by_exceptions(state: list, turn: str, move: tuple,
+                                   direction: tuple) -> tuple:
+    '''Returns (origin, direction) for a move in one direction, or
+    ((-1, -1), direction), as the original OthelloGame._check_direction
+    did.'''
+
+    count = 0
+
+    while True:
+        try:
+            tile = _return_tile_or_raise(state, move[0] + direction[0],
+                                         move[1] + direction[1])
+            if tile == turn or tile == othello.NONE:
+                break
+            else:
+                move = (move[0] + direction[0], move[1] + direction[1])
+                count += 1
+        except othello.OutsideBoardError:
+            return ((-1, -1), direction)
+    try:
+        origin_tile = _return_tile_or_raise(state, move[0] + direction[0],
+                                            move[1] + direction[1])
+        if count > 0 and origin_tile == turn:
+            return ((move[0] + direction[0], move[1] + direction[1]), direction)
+        else:
+            raise othello.OutsideBoardError()
+    except othello.OutsideBoardError:
+        return ((-1, -1), direction)
+
+def _return_tile_or_raise(state: list, column: int, row: int) -> str:
+    '''Returns the tile at a position of state, raising an
+    othello.OutsideBoardError off the board as the original _return_tile
+    did.'''
+
+    if column < 1 or row < 1:
+        raise othello.OutsideBoardError()
+
+    try:
+        return state[column - 1][row - 1]
+    except IndexError:
+        raise othello.OutsideBoardError()
+
+if __name__ == '__main__':
+
+    benchmark_move_generation()
+    benchmark_ray_walk()
+    benchmark_search()
+    benchmark_cloning()
+    benchmark_canonicalisation()
+    benchmark_endgame()
@@ -0,0 +1,393 @@
+import othello
+
+WHITE = othello.WHITE
+BLACK = othello.BLACK
+NONE = othello.NONE
+
+class BitboardOthelloGame:
+    '''An Othello game which keeps each color as an integer bitboard.
+    Has the same public interface as othello.OthelloGame, so it can be
+    used anywhere an OthelloGame is used.'''
+
+    def __init__(self, columns, rows, first_player: str, win_type: str,
+                 center_tile: str):
+        '''Creates a BitboardOthelloGame object with an empty board.'''
+
+        self._generate_game_board(columns, rows)
+        self._set_first_player(first_player)
+        self._set_win_condition(win_type)
+        self._set_center_tile(center_tile)
+
+    @property
+    def state(self) -> list:
+        '''Returns the board as a list of column lists, in the same form
+        as othello.OthelloGame.state.'''
+
+        board = []
+
+        for column in range(1, self.columns + 1):
+            board.append([])
+            for row in range(1, self.rows + 1):
+                board[column - 1].append(self._return_tile(column, row))
+
+        return board
+
+    def begin_game(self) -> None:
+        '''Generates the starting state for an Othello game by placing
+        the first four tiles in the center of the game board.'''
+
+        tile_type = self.center_tile
+        center = self._find_center()
+        self._place_tile((center[0], center[1]), tile_type[0])
+        self._place_tile((center[0], center[1] + 1), tile_type[1])
+        self._place_tile((center[0] + 1, center[1]), tile_type[1])
+        self._place_tile((center[0] + 1, center[1] + 1), tile_type[0])
+
+    def display(self) -> None:
+        '''Displays the current state of the BitboardOthelloGame object.'''
+
+        column_nums = '  '
+
+        for num in range(self.columns):
+            column_nums += str(num + 1) + ' '
+        print(column_nums)
+
+        for num in range(1, self.rows + 1):
+            row = '' + str(num) + ' '
+            for column in range(1, self.columns + 1):
+                row += self._return_tile(column, num) + ' '
+            print(row)
+
+    def execute_move(self, move: tuple) -> None:
+        '''Executes a move and then resets whose turn it is.'''
+
+        self.make_move(move)
+
+    def make_move(self, move: tuple) -> tuple:
+        '''Executes a move in the same way as execute_move and returns an
+        undo record which unmake_move can use to take the move back. The
+        record holds the position moved to, a list of the flipped tiles,
+        the player_turn before the move and the bitboards before the
+        move.'''
+
+        self.verify_move(move)
+        player_turn = self.player_turn
+        boards = (self.white, self.black)
+        bit = self._to_bit(move)
+        flips = self._return_flips(bit)
+        if self.player_turn == 1:
+            self.white = self.white | bit | flips
+            self.black = self.black & ~flips
+        else:
+            self.black = self.black | bit | flips
+            self.white = self.white & ~flips
+        self.player_turn = self.player_turn * -1
+        return (move, self._bits_to_moves(flips), player_turn, boards)
+
+    def unmake_move(self, record: tuple) -> None:
+        '''Takes back the move described by an undo record from make_move,
+        restoring the board and whose turn it is.'''
+
+        self.white, self.black = record[3]
+        self.player_turn = record[2]
+
+    def verify_move(self, move: tuple) -> None:
+        '''Checks if a move is valid, raises an InvalidMoveError
+        if the move is invalid, otherwise returns nothing.'''
+
+        if not self._on_board(move):
+            raise othello.InvalidMoveError
+        if not self._return_move_mask() & self._to_bit(move):
+            raise othello.InvalidMoveError
+
+    def get_possible_moves(self) -> list:
+        '''Returns a list of the (column, row) positions the current
+        player can move to.'''
+
+        return self._bits_to_moves(self._return_move_mask())
+
+    def get_flip_counts(self) -> dict:
+        '''Returns a dictionary mapping each possible move of the current
+        player to the number of tiles it would flip.'''
+
+        flip_counts = {}
+
+        for move in self.get_possible_moves():
+            flip_counts[move] = self._return_flips(self._to_bit(move)).bit_count()
+
+        return flip_counts
+
+    def check_if_player_can_move(self) -> bool:
+        '''Checks if a player has any valid moves. If so, returns True.
+        If not, skips to next players turn and returns False.'''
+
+        if self._return_move_mask() == 0:
+            self.player_turn = self.player_turn * -1
+            return False
+        else:
+            return True
+
+    def check_if_game_over(self) -> bool:
+        '''Checks if the game is over, either because the board is full
+        or there are no possible moves for both players.'''
+
+        if not self.check_if_player_can_move():
+            return not self.check_if_player_can_move()
+        else:
+            return False
+
+    def return_winner(self) -> str:
+        '''Returns who the winner of the current game state is.'''
+
+        score = self.get_score()
+
+        white_count = score[0]
+        black_count = score[1]
+
+        if self.win_condition == 'MOST':
+            return othello._return_highest_count(white_count, black_count)
+        if self.win_condition == 'LEAST':
+            return othello._return_lowest_count(white_count, black_count)
+
+    def get_turn(self) -> str:
+        '''Returns whose turn it is.'''
+
+        if self.player_turn == 1:
+            return WHITE
+        if self.player_turn == -1:
+            return BLACK
+
+    def get_string_turn(self) -> str:
+        '''Returns the full turn name, ex. WHITE, instead of just the
+        abbrevition.'''
+
+        if self.get_turn() == 'W':
+            return 'White'
+        if self.get_turn() == 'B':
+            return 'Black'
+
+    def get_score(self) -> tuple:
+        '''Returns the score in a tuple. (WHITE, BLACK).'''
+
+        return (self.white.bit_count(), self.black.bit_count())
+
+    def get_hash(self) -> int:
+        '''Returns the same 64 bit Zobrist hash as othello.OthelloGame
+        gives for this position, computed from the bitboards.'''
+
+        position_hash = othello._ZOBRIST_SIZE_KEYS[(self.columns, self.rows)]
+        for tile_type, bits in ((WHITE, self.white), (BLACK, self.black)):
+            keys = othello._ZOBRIST_TILE_KEYS[tile_type]
+            for move in self._bits_to_moves(bits):
+                position_hash ^= keys[(move[0] - 1) * 16 + move[1] - 1]
+        if self.player_turn == -1:
+            position_hash ^= othello._ZOBRIST_BLACK_TURN_KEY
+        if self.win_condition == 'LEAST':
+            position_hash ^= othello._ZOBRIST_LEAST_KEY
+        return position_hash
+
+    def get_empty_count(self) -> int:
+        '''Returns the number of empty tiles on the board.'''
+
+        return self.columns * self.rows - (self.white | self.black).bit_count()
+
+    def _generate_game_board(self, columns, rows: int) -> None:
+        '''Creates empty bitboards and the edge masks used when shifting
+        them for a board with the specified number of rows and columns.'''
+
+        othello._verify_board_size(columns, rows)
+
+        self.columns = columns
+        self.rows = rows
+        self.white = 0
+        self.black = 0
+        self._full_mask = (1 << (columns * rows)) - 1
+        self._shifts = return_shift_table(columns, rows)
+
+    def _set_first_player(self, first_player: str) -> None:
+        '''Verifies if the player entered is recognized as WHITE or BLACK and
+        then sets which is the first player.'''
+
+        if first_player == 'WHITE':
+            self.player_turn = 1
+        elif first_player == 'BLACK':
+            self.player_turn = -1
+        else:
+            raise othello.InvalidPlayerError()
+
+    def _set_win_condition(self, win_type) -> None:
+        '''Verifies if the win type is recognized and then assigns it.'''
+
+        if win_type == 'MOST':
+            self.win_condition = 'MOST'
+        elif win_type == 'LEAST':
+            self.win_condition = 'LEAST'
+        else:
+            raise othello.InvalidWinTypeError()
+
+    def _set_center_tile(self, tile_type) -> None:
+        '''Verifies if the tile_type is recognized and then assigns it.'''
+
+        if tile_type == 'WHITE':
+            self.center_tile = ('W', 'B')
+        elif tile_type == 'BLACK':
+            self.center_tile = ('B', 'W')
+        else:
+            raise othello.InvalidTileError()
+
+    def _get_opposite_turn(self) -> str:
+        '''Returns the opposite of whose turn it is.'''
+
+        if self.player_turn == 1:
+            return BLACK
+        return WHITE
+
+    def _get_num_columns(self) -> int:
+        '''Returns the number of columns in the game board.'''
+
+        return self.columns
+
+    def _get_num_rows(self) -> int:
+        '''Returns the number of rows in the game board.'''
+
+        return self.rows
+
+    def _find_center(self) -> tuple:
+        '''Locates the top left position of the four slot center of the
+        game board, in the same way as othello.OthelloGame.'''
+
+        return (int(self.columns/2), int(self.rows/2))
+
+    def _on_board(self, move: tuple) -> bool:
+        '''Returns True if a (column, row) position is on the board.'''
+
+        return 1 <= move[0] <= self.columns and 1 <= move[1] <= self.rows
+
+    def _to_bit(self, move: tuple) -> int:
+        '''Returns the single bit bitboard for a (column, row) position.'''
+
+        return 1 << ((move[1] - 1) * self.columns + (move[0] - 1))
+
+    def _bits_to_moves(self, bits: int) -> list:
+        '''Returns the (column, row) positions of every set bit.'''
+
+        moves = []
+
+        while bits:
+            low_bit = bits & -bits
+            index = low_bit.bit_length() - 1
+            moves.append((index % self.columns + 1, index // self.columns + 1))
+            bits ^= low_bit
+
+        return moves
+
+    def _place_tile(self, move: tuple, tile_type: str) -> None:
+        '''Places a tile in a specified position on the board.'''
+
+        bit = self._to_bit(move)
+        self.white &= ~bit
+        self.black &= ~bit
+        if tile_type == WHITE:
+            self.white |= bit
+        elif tile_type == BLACK:
+            self.black |= bit
+
+    def _return_tile(self, column: int, row: int) -> str:
+        '''Returns the type of tile in a specified position on the board,
+        raises an OutsideBoardError if the position is not on the board.'''
+
+        if not self._on_board((column, row)):
+            raise othello.OutsideBoardError()
+
+        bit = self._to_bit((column, row))
+        if self.white & bit:
+            return WHITE
+        if self.black & bit:
+            return BLACK
+        return NONE
+
+    def _return_players(self) -> tuple:
+        '''Returns the bitboards of the current player and their opponent.'''
+
+        if self.player_turn == 1:
+            return (self.white, self.black)
+        return (self.black, self.white)
+
+    def _return_move_mask(self) -> int:
+        '''Returns a bitboard of every move the current player can make.'''
+
+        player, opponent = self._return_players()
+        empty = self._full_mask & ~(player | opponent)
+        return return_move_bits(player, opponent, empty, self._shifts)
+
+    def _return_flips(self, bit: int) -> int:
+        '''Returns a bitboard of the tiles flipped by moving to bit.'''
+
+        player, opponent = self._return_players()
+        flips = 0
+
+        for shift, mask in self._shifts:
+            line = 0
+            if shift > 0:
+                step = (bit << shift) & mask
+                while step & opponent:
+                    line |= step
+                    step = (step << shift) & mask
+            else:
+                step = (bit >> -shift) & mask
+                while step & opponent:
+                    line |= step
+                    step = (step >> -shift) & mask
+            if step & player:
+                flips |= line
+
+        return flips
+
+def return_shift_table(columns: int, rows: int) -> tuple:
+    '''Returns the (shift, mask) pairs used to move a bitboard one step
+    in each of the 8 directions on a board of this size. A positive shift
+    moves bits towards higher indices, and the mask clears bits that
+    wrapped onto another row.'''
+
+    full_mask = (1 << (columns * rows)) - 1
+    first_column = 0
+    last_column = 0
+    for row in range(rows):
+        first_column |= 1 << (row * columns)
+        last_column |= 1 << (row * columns + columns - 1)
+
+    not_first_column = full_mask & ~first_column
+    not_last_column = full_mask & ~last_column
+
+    return ((1, not_first_column), (-1, not_last_column),
+            (columns, full_mask), (-columns, full_mask),
+            (columns + 1, not_first_column), (columns - 1, not_last_column),
+            (-columns + 1, not_first_column), (-columns - 1, not_last_column))
+
+def return_move_bits(player: int, opponent: int, empty: int,
+                     shifts: tuple) -> int:
+    '''Returns a bitboard of every empty square where player can move,
+    given the bitboards of both players and a shift table from
+    return_shift_table.'''
+
+    moves = 0
+
+    for shift, mask in shifts:
+        if shift > 0:
+            run = (player << shift) & mask & opponent
+            while True:
+                extended = run | ((run << shift) & mask & opponent)
+                if extended == run:
+                    break
+                run = extended
+            moves |= (run << shift) & mask & empty
+        else:
+            run = (player >> -shift) & mask & opponent
+            while True:
+                extended = run | ((run >> -shift) & mask & opponent)
+                if extended == run:
+                    break
+                run = extended
+            moves |= (run >> -shift) & mask & empty
+
+    return moves
@@ -0,0 +1,217 @@
+import argparse
+import hashlib
+import mmap
+import struct
+import sys
+import othello
+import othello_records
+import othello_symmetry
+
+# A book file starts with FILE_HEADER and then holds ENTRY records sorted
+# by (key, move). Each entry is a canonical position key, a move byte in
+# the canonical position ((row - 1) * columns + (column - 1)), the number
+# of games the move was played in and the points the mover scored in
+# those games, 2 for a win and 1 for a tie.
+FILE_HEADER = b'OTHB\x01'
+ENTRY = struct.Struct('<QBII')
+
+# Default limits for building a book: only positions in the first
+# BOOK_PLIES moves of a game are kept, and only moves played in at least
+# MIN_GAMES games.
+BOOK_PLIES = 20
+MIN_GAMES = 2
+
+class BookError(Exception):
+    pass
+
+class OpeningBook:
+    '''Read only opening book looked up through mmap and binary search,
+    so opening it costs nothing and the pages are shared by every process
+    that opens the same file. Positions are keyed by canonical_key, so a
+    position is found in the book whichever symmetry of it was played.'''
+
+    def __init__(self, path: str):
+        '''Opens and maps the book file at path.'''
+
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access = mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise BookError()
+
+        entry_bytes = len(self._map) - len(FILE_HEADER)
+        if (self._map[:len(FILE_HEADER)] != FILE_HEADER
+            or entry_bytes % ENTRY.size != 0):
+            self.close()
+            raise BookError()
+
+        self._entry_count = entry_bytes // ENTRY.size
+
+    def __len__(self) -> int:
+        '''Returns the number of (position, move) entries in the book.'''
+
+        return self._entry_count
+
+    def __enter__(self) -> 'OpeningBook':
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
+
+    def lookup(self, game: othello.OthelloGame) -> list:
+        '''Returns a list of (move, games, score) for every book move of the
+        current position of game, where move is a (column, row) position
+        on game's board and score is the fraction of points the mover
+        scored with it. The list is empty if the position is not in the
+        book.'''
+
+        columns = game._get_num_columns()
+        key, transform = canonical_key(game)
+        moves = []
+
+        offset = self._find_first(key)
+        while offset < len(self._map):
+            entry_key, square, games, points = ENTRY.unpack_from(self._map, offset)
+            if entry_key != key:
+                break
+            move = (square % columns + 1, square // columns + 1)
+            moves.append((transform.restore_move(move), games,
+                          points / (2 * games)))
+            offset += ENTRY.size
+
+        return moves
+
+    def choose_move(self, game: othello.OthelloGame) -> tuple:
+        '''Returns the book move with the best score for the current
+        player of game, preferring the most played move on ties, or None
+        if the position is not in the book.'''
+
+        moves = self.lookup(game)
+
+        if len(moves) == 0:
+            return None
+        return max(moves, key = lambda entry: (entry[2], entry[1]))[0]
+
+    def close(self) -> None:
+        '''Unmaps and closes the file.'''
+
+        self._map.close()
+        self._file.close()
+
+    def _find_first(self, key: int) -> int:
+        '''Returns the offset of the first entry with a key of at least
+        key, or the end of the file if there is none.'''
+
+        low = 0
+        high = self._entry_count
+
+        while low < high:
+            middle = (low + high) // 2
+            offset = len(FILE_HEADER) + middle * ENTRY.size
+            if ENTRY.unpack_from(self._map, offset)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return len(FILE_HEADER) + low * ENTRY.size
+
+def canonical_key(game: othello.OthelloGame) -> tuple:
+    '''Returns (key, transform) for the current position of game. key is
+    a 64 bit hash of the board size, whose turn it is, the win type and
+    the smallest of the boards the symmetries of the board's shape map
+    the position to, so every symmetric position has the same key.
+    transform is the othello_symmetry.Transform that gives the canonical
+    board.'''
+
+    columns = game._get_num_columns()
+    rows = game._get_num_rows()
+    packed, transform = othello_symmetry.canonicalise_packed(
+        othello_symmetry.pack_state(game.state), columns, rows)
+
+    description = '{}x{} {} {} {}'.format(columns, rows, game.get_turn(),
+        game.win_condition, packed)
+    key = int.from_bytes(hashlib.blake2b(description.encode('ascii'),
+                                         digest_size = 8).digest(), 'little')
+
+    return (key, transform)
+
+def build_book(record_paths: list, book_path: str, plies: int = BOOK_PLIES,
+               min_games: int = MIN_GAMES) -> int:
+    '''Builds a book file at book_path from the games in the othello_records
+    files at record_paths. Every move in the first plies moves of each
+    game is counted for its canonical position, with 2 points to the mover
+    for a win and 1 for a tie. Moves played in fewer than min_games games
+    are left out. Returns the number of entries written.'''
+
+    stats = {}
+
+    for record_path in record_paths:
+        with open(record_path, 'rb') as record_file:
+            for record in othello_records.read_records(record_file):
+                _add_game(stats, record, plies)
+
+    entries = sorted((key, square, counts[0], counts[1])
+                     for (key, square), counts in stats.items()
+                     if counts[0] >= min_games)
+
+    with open(book_path, 'wb') as book_file:
+        book_file.write(FILE_HEADER)
+        for entry in entries:
+            book_file.write(ENTRY.pack(*entry))
+
+    return len(entries)
+
+def main(arguments: list = None) -> None:
+    '''Builds an opening book from the command line.'''
+
+    parser = argparse.ArgumentParser(
+        description = 'Builds an Othello opening book from game records.')
+    parser.add_argument('book', help = 'book file to write')
+    parser.add_argument('records', nargs = '+',
+                        help = 'binary record files written by othello_simulate')
+    parser.add_argument('--plies', type = int, default = BOOK_PLIES)
+    parser.add_argument('--min-games', type = int, default = MIN_GAMES)
+    args = parser.parse_args(arguments)
+
+    entry_count = build_book(args.records, args.book, args.plies,
+                             args.min_games)
+    print('{} entries written to {}'.format(entry_count, args.book),
+          file = sys.stderr)
+
+
+#FUNCTIONS USED BY THE OPENING BOOK:
+
+def _add_game(stats: dict, record: 'GameRecord', plies: int) -> None:
+    '''Replays one game record and adds its first plies moves to stats,
+    which maps (key, canonical square) to [games, points].'''
+
+    game = record.create_game()
+    played = []
+
+    for move in record.moves:
+        if move is None:
+            if game.check_if_player_can_move():
+                raise othello.InvalidMoveError()
+            continue
+        if len(played) < plies:
+            key, transform = canonical_key(game)
+            column, row = transform.transform_move(move)
+            played.append(((key, (row - 1) * record.columns + column - 1),
+                           game.get_string_turn().upper()))
+        game.execute_move(move)
+
+    winner = game.return_winner()
+
+    for entry_key, mover in played:
+        counts = stats.setdefault(entry_key, [0, 0])
+        counts[0] += 1
+        if winner == mover:
+            counts[1] += 2
+        elif winner == 'TIE':
+            counts[1] += 1
+
+if __name__ == '__main__':
+
+    main()
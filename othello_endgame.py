@@ -0,0 +1,410 @@
+import time
+import othello
+import othello_bitboard
+
+# The largest number of empty squares the solver accepts by default.
+MAX_EMPTIES = 20
+
+# Above this many empty squares moves are ordered fastest first, by the
+# number of replies left to the opponent. Below it the cost of counting
+# replies is more than the nodes it saves, so only parity is used.
+FASTEST_FIRST_EMPTIES = 7
+
+# Positions with at least this many empty squares keep the bounds found
+# for them in a table for the rest of the solve, since with more empty
+# squares the same position is often reached by different move orders.
+TABLE_EMPTIES = 9
+
+class EndgameSizeError(Exception):
+    pass
+
+class BoardTables:
+    '''Tables that only depend on the size of the board. Squares are bit
+    indexes, (row - 1) * columns + (column - 1), the same as in
+    othello_bitboard and othello_records.'''
+
+    def __init__(self, columns: int, rows: int):
+        '''Builds the tables for a board with columns columns and rows
+        rows.'''
+
+        othello._verify_board_size(columns, rows)
+
+        self.columns = columns
+        self.rows = rows
+        self.full_mask = (1 << (columns * rows)) - 1
+        self.shifts = othello_bitboard.return_shift_table(columns, rows)
+        self.bits = []
+        self.rays = []
+        self.regions = []
+        ray_table = othello._return_ray_table(columns, rows)
+
+        for square in range(columns * rows):
+            column = square % columns
+            row = square // columns
+            self.bits.append(1 << square)
+            self.rays.append(self._return_rays(ray_table[(column + 1, row + 1)]))
+            region = 0
+            if column >= columns // 2:
+                region += 1
+            if row >= rows // 2:
+                region += 2
+            self.regions.append(1 << region)
+
+    def _return_rays(self, rays: dict) -> list:
+        '''Returns, for each direction with room for a capture, a tuple of
+        the bits from next to a position up to the edge, taken from the
+        position's rays in othello's shared ray table.'''
+
+        return [tuple(1 << ((row - 1) * self.columns + column - 1)
+                      for column, row in ray[0])
+                for ray in rays.values()]
+
+_tables = {}
+
+def get_tables(columns: int, rows: int) -> BoardTables:
+    '''Returns the BoardTables for a board size, building them the first
+    time the size is used and sharing them after that.'''
+
+    tables = _tables.get((columns, rows))
+
+    if tables is None:
+        tables = BoardTables(columns, rows)
+        _tables[(columns, rows)] = tables
+
+    return tables
+
+class EndgameSolver:
+    '''Finds the exact result of an Othello position with perfect play by
+    both players, for positions with only a few empty squares left. The
+    search is a negamax over the final disc difference with alpha-beta
+    pruning and a table of bounds, with moves ordered by region parity
+    and, with more empty squares, fastest first. The last 3, 2 and 1
+    empty squares are solved by special routines that skip move lists
+    and ordering.'''
+
+    def __init__(self, max_empties: int = MAX_EMPTIES):
+        '''Creates an EndgameSolver for positions with at most max_empties
+        empty squares.'''
+
+        self.max_empties = max_empties
+        self.nodes = 0
+        self.seconds = 0.0
+
+    def solve(self, game: othello.OthelloGame) -> dict:
+        '''Solves the position of game, which can be an othello.OthelloGame
+        or any game with the same interface, and returns a dictionary
+        with the best move for the current player (None if they have to
+        pass or the game is over), the final score as the current
+        player's discs minus their opponent's, the winner, the number of
+        nodes searched and the solve time in seconds. Under the 'LEAST'
+        win type each player plays to end with as few discs as possible.
+        The game is not changed. Raises an EndgameSizeError if the
+        position has more than max_empties empty squares.'''
+
+        if game.get_empty_count() > self.max_empties:
+            raise EndgameSizeError()
+
+        start = time.perf_counter()
+        self.nodes = 0
+        self._bounds = {}
+        self._tables = get_tables(game._get_num_columns(), game._get_num_rows())
+        if game.win_condition == 'LEAST':
+            self._sign = -1
+        else:
+            self._sign = 1
+
+        player, opponent, empties = self._return_position(game)
+        parity = 0
+        for square in empties:
+            parity ^= self._tables.regions[square]
+
+        limit = len(self._tables.bits)
+        move, value = self._solve_root(player, opponent, empties, parity,
+                                       -limit - 1, limit + 1)
+        score = self._sign * value
+        white_difference = score * game.player_turn
+
+        if white_difference == 0:
+            winner = 'TIE'
+        elif (white_difference > 0) == (self._sign == 1):
+            winner = 'WHITE'
+        else:
+            winner = 'BLACK'
+        if move is not None:
+            move = (move % self._tables.columns + 1,
+                    move // self._tables.columns + 1)
+
+        self._bounds = {}
+        self.seconds = time.perf_counter() - start
+
+        return {'move': move, 'score': score, 'winner': winner,
+                'nodes': self.nodes, 'seconds': self.seconds}
+
+    def choose_move(self, game: othello.OthelloGame) -> tuple:
+        '''Returns a perfect move for the current player of game, or None
+        if the current player has no possible moves.'''
+
+        return self.solve(game)['move']
+
+    def _return_position(self, game: othello.OthelloGame) -> tuple:
+        '''Returns the bitboards of the current player and their opponent
+        and a list of the empty squares of game.'''
+
+        columns = self._tables.columns
+        player_tile = game.get_turn()
+        player = 0
+        opponent = 0
+        empties = []
+
+        for column_index, column in enumerate(game.state):
+            for row_index, tile in enumerate(column):
+                square = row_index * columns + column_index
+                if tile == othello.NONE:
+                    empties.append(square)
+                elif tile == player_tile:
+                    player |= 1 << square
+                else:
+                    opponent |= 1 << square
+
+        empties.sort()
+        return (player, opponent, empties)
+
+    def _solve_root(self, player: int, opponent: int, empties: list,
+                    parity: int, alpha: int, beta: int) -> tuple:
+        '''Searches every move of the root position and returns (best
+        square, value), where the square is None if the player cannot
+        move.'''
+
+        moves = self._return_ordered_moves(player, opponent, empties, parity)
+
+        if len(moves) == 0:
+            return (None, self._solve(player, opponent, empties, parity,
+                                      alpha, beta, False))
+
+        best_square = None
+        bits = self._tables.bits
+        regions = self._tables.regions
+
+        for square, flips, index in moves:
+            child_empties = empties[:index] + empties[index + 1:]
+            value = -self._solve(opponent & ~flips, player | bits[square] | flips,
+                                 child_empties, parity ^ regions[square],
+                                 -beta, -alpha, False)
+            if value > alpha:
+                alpha = value
+                best_square = square
+
+        return (best_square, alpha)
+
+    def _solve(self, player: int, opponent: int, empties: list, parity: int,
+               alpha: int, beta: int, passed: bool) -> int:
+        '''Returns the value of a position for the player to move, which
+        is their final disc difference, negated under 'LEAST'. passed is
+        True if the previous player had to pass.'''
+
+        empty_count = len(empties)
+        if empty_count == 3:
+            return self._solve_3(player, opponent, empties, parity,
+                                 alpha, beta, passed)
+        if empty_count == 2:
+            return self._solve_2(player, opponent, empties[0], empties[1],
+                                 alpha, beta, passed)
+        if empty_count == 1:
+            return self._solve_1(player, opponent, empties[0])
+        if empty_count == 0:
+            self.nodes += 1
+            return self._sign * (player.bit_count() - opponent.bit_count())
+
+        self.nodes += 1
+        key = None
+        if empty_count >= TABLE_EMPTIES:
+            key = (player, opponent)
+            bounds = self._bounds.get(key)
+            if bounds is not None:
+                if bounds[0] >= beta:
+                    return bounds[0]
+                if bounds[1] <= alpha:
+                    return bounds[1]
+                alpha = max(alpha, bounds[0])
+                beta = min(beta, bounds[1])
+
+        moves = self._return_ordered_moves(player, opponent, empties, parity)
+
+        if len(moves) == 0:
+            if passed:
+                return self._sign * (player.bit_count() - opponent.bit_count())
+            return -self._solve(opponent, player, empties, parity,
+                                -beta, -alpha, True)
+
+        bits = self._tables.bits
+        regions = self._tables.regions
+        original_alpha = alpha
+        best_value = -len(bits) - 1
+
+        for square, flips, index in moves:
+            child_empties = empties[:index] + empties[index + 1:]
+            value = -self._solve(opponent & ~flips, player | bits[square] | flips,
+                                 child_empties, parity ^ regions[square],
+                                 -beta, -alpha, False)
+            if value > best_value:
+                best_value = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if key is not None:
+            lower, upper = self._bounds.get(key, (-len(bits), len(bits)))
+            if best_value <= original_alpha:
+                upper = best_value
+            elif best_value >= beta:
+                lower = best_value
+            else:
+                lower = upper = best_value
+            self._bounds[key] = (lower, upper)
+
+        return best_value
+
+    def _solve_3(self, player: int, opponent: int, empties: list,
+                 parity: int, alpha: int, beta: int, passed: bool) -> int:
+        '''Solves a position with 3 empty squares, trying squares in
+        regions with an odd number of empty squares first.'''
+
+        self.nodes += 1
+        bits = self._tables.bits
+        regions = self._tables.regions
+        first, second, third = empties
+
+        if not parity & regions[first]:
+            if parity & regions[second]:
+                first, second = second, first
+            elif parity & regions[third]:
+                first, third = third, first
+
+        best_value = None
+
+        for square, rest in ((first, (second, third)), (second, (first, third)),
+                             (third, (first, second))):
+            flips = self._return_flips(player, opponent, square)
+            if flips == 0:
+                continue
+            value = -self._solve_2(opponent & ~flips,
+                                   player | bits[square] | flips,
+                                   rest[0], rest[1], -beta, -alpha, False)
+            if best_value is None or value > best_value:
+                best_value = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if best_value is None:
+            if passed:
+                return self._sign * (player.bit_count() - opponent.bit_count())
+            return -self._solve_3(opponent, player, empties, parity,
+                                  -beta, -alpha, True)
+
+        return best_value
+
+    def _solve_2(self, player: int, opponent: int, first: int, second: int,
+                 alpha: int, beta: int, passed: bool) -> int:
+        '''Solves a position with the 2 empty squares first and second.'''
+
+        self.nodes += 1
+        bits = self._tables.bits
+        best_value = None
+
+        flips = self._return_flips(player, opponent, first)
+        if flips:
+            best_value = -self._solve_1(opponent & ~flips,
+                                        player | bits[first] | flips, second)
+            if best_value >= beta:
+                return best_value
+
+        flips = self._return_flips(player, opponent, second)
+        if flips:
+            value = -self._solve_1(opponent & ~flips,
+                                   player | bits[second] | flips, first)
+            if best_value is None or value > best_value:
+                best_value = value
+
+        if best_value is None:
+            if passed:
+                return self._sign * (player.bit_count() - opponent.bit_count())
+            return -self._solve_2(opponent, player, first, second,
+                                  -beta, -alpha, True)
+
+        return best_value
+
+    def _solve_1(self, player: int, opponent: int, square: int) -> int:
+        '''Solves a position with the single empty square square. The
+        player moves there if they can, otherwise their opponent does if
+        they can, otherwise the game ends with the square empty.'''
+
+        self.nodes += 1
+        difference = player.bit_count() - opponent.bit_count()
+
+        flips = self._return_flips(player, opponent, square)
+        if flips:
+            return self._sign * (difference + 1 + 2 * flips.bit_count())
+
+        flips = self._return_flips(opponent, player, square)
+        if flips:
+            return self._sign * (difference - 1 - 2 * flips.bit_count())
+
+        return self._sign * difference
+
+    def _return_ordered_moves(self, player: int, opponent: int,
+                              empties: list, parity: int) -> list:
+        '''Returns a list of (square, flips, index in empties) for every
+        move of the player, ordered by parity and, with enough empty
+        squares, by how few replies each move leaves the opponent.'''
+
+        moves = []
+
+        for index, square in enumerate(empties):
+            flips = self._return_flips(player, opponent, square)
+            if flips:
+                moves.append((square, flips, index))
+
+        if len(moves) < 2:
+            return moves
+
+        regions = self._tables.regions
+
+        if len(empties) <= FASTEST_FIRST_EMPTIES:
+            moves.sort(key = lambda move: not parity & regions[move[0]])
+            return moves
+
+        bits = self._tables.bits
+        shifts = self._tables.shifts
+        empty = self._tables.full_mask & ~(player | opponent)
+
+        def return_key(move: tuple) -> tuple:
+            square, flips, index = move
+            replies = othello_bitboard.return_move_bits(
+                opponent & ~flips, player | bits[square] | flips,
+                empty & ~bits[square], shifts).bit_count()
+            return (replies, not parity & regions[square])
+
+        moves.sort(key = return_key)
+        return moves
+
+    def _return_flips(self, player: int, opponent: int, square: int) -> int:
+        '''Returns a bitboard of the discs flipped if player moves to the
+        empty square square, which is 0 if the move is not allowed.'''
+
+        flips = 0
+
+        for ray in self._tables.rays[square]:
+            line = 0
+            for bit in ray:
+                if bit & opponent:
+                    line |= bit
+                elif bit & player:
+                    flips |= line
+                    break
+                else:
+                    break
+
+        return flips
@@ -0,0 +1,21 @@
+import othello
+import othello_bitboard
+
+# The game classes create_game can build, by engine name. Both have the
+# interface of othello.OthelloGame.
+ENGINES = {'list': othello.OthelloGame,
+           'bitboard': othello_bitboard.BitboardOthelloGame}
+
+class InvalidEngineError(Exception):
+    pass
+
+def create_game(columns, rows, first_player: str, win_type: str,
+                center_tile: str, engine: str = 'list') -> 'game':
+    '''Returns a new game with these settings, an othello.OthelloGame for
+    the 'list' engine or an othello_bitboard.BitboardOthelloGame for
+    'bitboard'. Raises an InvalidEngineError for any other engine.'''
+
+    if engine not in ENGINES:
+        raise InvalidEngineError()
+
+    return ENGINES[engine](columns, rows, first_player, win_type, center_tile)
@@ -0,0 +1,205 @@
+import othello
+
+# Weights of each part of the evaluation.
+POSITION_WEIGHT = 1
+MOBILITY_WEIGHT = 8
+FRONTIER_WEIGHT = 4
+STABILITY_WEIGHT = 12
+
+# Positional weight of each kind of square.
+CORNER_SQUARE = 25
+X_SQUARE = -12
+C_SQUARE = -6
+EDGE_SQUARE = 3
+INNER_SQUARE = 0
+
+# othello.DIRECTIONS ordered so that opposite directions are 4 apart, so
+# DIRECTIONS[index] and DIRECTIONS[index + 4] make up one line through a
+# position.
+DIRECTIONS = [othello.DIRECTIONS[name] for name in
+              ['up', 'up_right', 'right', 'down_right', 'down', 'down_left',
+               'left', 'up_left']]
+
+_geometries = {}
+
+class BoardGeometry:
+    '''Tables that only depend on the size of the board. Positions in the
+    list of lists tables are zero based [column][row] indexes, like
+    OthelloGame.state, and positions in weight_table are one based
+    (column, row) moves.'''
+
+    def __init__(self, columns: int, rows: int):
+        '''Builds the tables for a board with columns columns and rows
+        rows.'''
+
+        othello._verify_board_size(columns, rows)
+
+        self.columns = columns
+        self.rows = rows
+        self.corners = [(0, 0), (0, rows - 1), (columns - 1, 0),
+                        (columns - 1, rows - 1)]
+        self.weights = []
+        self.weight_table = {}
+        self.neighbours = []
+        self.rays = []
+        line_table = othello._return_line_table(columns, rows)
+
+        for column in range(columns):
+            self.weights.append([])
+            self.neighbours.append([])
+            self.rays.append([])
+            for row in range(rows):
+                weight = self._return_weight(column, row)
+                self.weights[column].append(weight)
+                self.weight_table[(column + 1, row + 1)] = weight
+                rays = self._return_rays(line_table[(column + 1, row + 1)])
+                self.rays[column].append(rays)
+                self.neighbours[column].append([ray[0] for ray in rays if ray])
+
+    def _return_weight(self, column: int, row: int) -> int:
+        '''Returns the positional weight of a zero based position.'''
+
+        column_edge = column in (0, self.columns - 1)
+        row_edge = row in (0, self.rows - 1)
+        column_near = column in (1, self.columns - 2)
+        row_near = row in (1, self.rows - 2)
+
+        if column_edge and row_edge:
+            return CORNER_SQUARE
+        if (column_edge and row_near) or (column_near and row_edge):
+            return C_SQUARE
+        if column_near and row_near:
+            return X_SQUARE
+        if column_edge or row_edge:
+            return EDGE_SQUARE
+        return INNER_SQUARE
+
+    def _return_rays(self, lines: dict) -> list:
+        '''Returns a list with, for each of the 8 DIRECTIONS, the zero based
+        positions from next to a position up to the edge of the board,
+        taken from the position's lines in othello's shared line table.'''
+
+        return [[(column - 1, row - 1) for column, row in lines[direction]]
+                for direction in DIRECTIONS]
+
+def get_geometry(columns: int, rows: int) -> BoardGeometry:
+    '''Returns the BoardGeometry for a board size, building it the first
+    time the size is used and sharing it after that.'''
+
+    geometry = _geometries.get((columns, rows))
+
+    if geometry is None:
+        geometry = BoardGeometry(columns, rows)
+        _geometries[(columns, rows)] = geometry
+
+    return geometry
+
+def evaluate(game: othello.OthelloGame) -> int:
+    '''Returns a heuristic score of a position from the point of view of
+    the player whose turn it is. The score adds up positional weights,
+    mobility, frontier tiles (tiles next to an empty square, which are
+    bad) and stable tiles that can never be flipped. Under the 'LEAST'
+    win type the positional and stable tile terms count against the
+    player, since those tiles are hard to get rid of, while mobility and
+    frontier tiles keep their meaning.'''
+
+    geometry = get_geometry(game._get_num_columns(), game._get_num_rows())
+    player = game.get_turn()
+    opponent = game._get_opposite_turn()
+    state = game.state
+
+    move_count = len(game.get_possible_moves())
+    game.player_turn = game.player_turn * -1
+    opponent_move_count = len(game.get_possible_moves())
+    game.player_turn = game.player_turn * -1
+
+    position_score = 0
+    frontier_score = 0
+
+    for column_index, column in enumerate(state):
+        weights = geometry.weights[column_index]
+        neighbours = geometry.neighbours[column_index]
+        for row_index, tile in enumerate(column):
+            if tile == othello.NONE:
+                continue
+            if tile == player:
+                sign = 1
+            else:
+                sign = -1
+            position_score += sign * weights[row_index]
+            for neighbour in neighbours[row_index]:
+                if state[neighbour[0]][neighbour[1]] == othello.NONE:
+                    frontier_score -= sign
+                    break
+
+    stable_counts = return_stable_counts(game, geometry)
+    stability_score = stable_counts[player] - stable_counts[opponent]
+
+    if game.win_condition == 'LEAST':
+        position_score = -position_score
+        stability_score = -stability_score
+
+    return (POSITION_WEIGHT * position_score
+            + MOBILITY_WEIGHT * (move_count - opponent_move_count)
+            + FRONTIER_WEIGHT * frontier_score
+            + STABILITY_WEIGHT * stability_score)
+
+def return_stable_counts(game: othello.OthelloGame,
+                         geometry: BoardGeometry = None) -> dict:
+    '''Returns a dictionary with the number of stable tiles of WHITE and
+    BLACK. A tile is counted as stable when, along each of the 4 lines
+    through it, the line is full or the tile is next to the edge or to a
+    stable tile of its own color. Tiles can only become stable starting
+    from a corner, so boards with empty corners are skipped.'''
+
+    if geometry is None:
+        geometry = get_geometry(game._get_num_columns(), game._get_num_rows())
+
+    state = game.state
+    stable_counts = {othello.WHITE: 0, othello.BLACK: 0}
+
+    if all(state[corner[0]][corner[1]] == othello.NONE
+           for corner in geometry.corners):
+        return stable_counts
+
+    stable = set()
+    changed = True
+
+    while changed:
+        changed = False
+        for column_index, column in enumerate(state):
+            for row_index, tile in enumerate(column):
+                if tile == othello.NONE or (column_index, row_index) in stable:
+                    continue
+                rays = geometry.rays[column_index][row_index]
+                if all(_is_axis_stable(state, stable, tile, rays[index],
+                                       rays[index + 4])
+                       for index in range(4)):
+                    stable.add((column_index, row_index))
+                    stable_counts[tile] += 1
+                    changed = True
+
+    return stable_counts
+
+
+#FUNCTIONS USED BY THE EVALUATION:
+
+def _is_axis_stable(state: list, stable: set, tile: str, ray: list,
+                    opposite_ray: list) -> bool:
+    '''Returns True if a tile cannot be flipped along the line made of
+    ray and opposite_ray.'''
+
+    for side in (ray, opposite_ray):
+        if len(side) == 0:
+            return True
+        neighbour = side[0]
+        if (neighbour in stable
+            and state[neighbour[0]][neighbour[1]] == tile):
+            return True
+
+    for side in (ray, opposite_ray):
+        for position in side:
+            if state[position[0]][position[1]] == othello.NONE:
+                return False
+
+    return True
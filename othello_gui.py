@@ -1,21 +1,37 @@
 
+import argparse
+import time
 import tkinter
-import othello
+import othello_engine
 import othello_gui_dialog_boxes
-import point
+import othello_worker
+
+# Least number of milliseconds between redraws while the window is resized.
+REDRAW_INTERVAL = 16
+
+# Seconds the background analysis searches for the best move.
+ANALYSIS_TIME_LIMIT = 5.0
+
+# Colors of the possible move markers and of the best move hint.
+HINT_COLOR = '#0F7A37'
+BEST_MOVE_COLOR = '#FFD700'
 
 class OthelloGui:
     '''Gui for the Othello application.'''
     
-    def __init__(self):
+    def __init__(self, engine: str = 'list',
+                 on_ui_update: 'function' = None, show_moves: bool = True):
+        self.on_ui_update = on_ui_update
+        self.show_moves = show_moves
+
         input_window = othello_gui_dialog_boxes.InputDialog()
         input_window.show()
 
         self.root_window = tkinter.Tk()
 
-        self.state = othello.OthelloGame(input_window.input_num_columns,
+        self.state = othello_engine.create_game(input_window.input_num_columns,
             input_window.input_num_rows, input_window.input_first_player,
-            input_window.input_win_type, input_window.input_corner_tile)
+            input_window.input_win_type, input_window.input_corner_tile, engine)
         self.state.begin_game()
 
         title = tkinter.Label(
@@ -36,6 +52,7 @@ class OthelloGui:
 
         self.info_board.grid_propagate(5)
 
+        self._create_info_board()
         self._update_info_board()
 
         self.game_board = tkinter.Canvas(
@@ -48,15 +65,31 @@ class OthelloGui:
 
         self.game_board.bind('<Configure>', self._on_resize)
         self.game_board.bind('<Button-1>', self._on_click)
+        self.root_window.bind('<Key-a>', self._on_analyze)
+        self.root_window.bind('<Key-m>', self._on_toggle_moves)
+
+        self.worker = othello_worker.AnalysisWorker(self.root_window)
+        self.root_window.protocol('WM_DELETE_WINDOW', self._on_close)
 
         self.root_window.rowconfigure(0, weight = 0)
         self.root_window.columnconfigure(0, weight = 1)
         self.root_window.rowconfigure(1, weight = 0)
         self.root_window.rowconfigure(2, weight = 1)
 
+        self._line_items = []
+        self._tile_items = {}
+        self._hint_items = {}
+        self._move_hints = {}
+        self._best_move = None
+        self._canvas_size = None
+        self._redraw_id = None
+
+        self._compute_geometry()
         self._draw_board(self.state._get_num_columns(),
             self.state._get_num_rows())
+        self._create_tiles()
         self._draw_tiles_from_game_state()
+        self._update_move_hints()
 
     def start(self) -> None:
         '''Initiates the tkinter mainloop n order to run the Othello
@@ -65,39 +98,102 @@ class OthelloGui:
         self.root_window.mainloop()
 
 
-    def _draw_board(self, num_columns: int, num_rows: int) -> None:
-        '''Draws the game board.'''
+    def _compute_geometry(self) -> bool:
+        '''Computes the pixel size of a board position, the line
+        coordinates and the bounding box of every tile for the current
+        canvas size. Returns False if the size has not changed since the
+        last time the geometry was computed.'''
 
         canvas_width = self.game_board.winfo_width()
         canvas_height = self.game_board.winfo_height()
 
+        if (canvas_width, canvas_height) == self._canvas_size:
+            return False
+        self._canvas_size = (canvas_width, canvas_height)
+
+        num_columns = self.state._get_num_columns()
+        num_rows = self.state._get_num_rows()
+
         self.row_pixel_size = canvas_height/num_rows
         self.column_pixel_size = canvas_width/num_columns
 
-        origin = point.Point(0, 0)
-        vertical_end = point.Point(0, 1)
-        horizontal_end = point.Point(1, 0)
-
-        origin_x, origin_y = origin.pixel(canvas_width, canvas_height)
-        vert_x, vert_y = vertical_end.pixel(canvas_width, canvas_height)
+        self._line_coords = []
         for column in range(num_columns):
-            self.game_board.create_line(origin_x, origin_y, vert_x, vert_y)
-            origin_x += self.column_pixel_size
-            vert_x += self.column_pixel_size
-
-        origin_x, origin_y = origin.pixel(canvas_width, canvas_height)
-        hori_x, hori_y = horizontal_end.pixel(canvas_width, canvas_height)
-        for column in range(num_rows):
-            self.game_board.create_line(origin_x, origin_y, hori_x, hori_y)
-            origin_y += self.row_pixel_size
-            hori_y += self.row_pixel_size
+            x = int(self.column_pixel_size * column)
+            self._line_coords.append((x, 0, x, canvas_height))
+        for row in range(num_rows):
+            y = int(self.row_pixel_size * row)
+            self._line_coords.append((0, y, canvas_width, y))
+
+        self._tile_boxes = {}
+        for column in range(1, num_columns + 1):
+            for row in range(1, num_rows + 1):
+                self._tile_boxes[(column, row)] = (
+                    self.column_pixel_size * (column - 1),
+                    self.row_pixel_size * (row - 1),
+                    self.column_pixel_size * column,
+                    self.row_pixel_size * row)
+
+        return True
 
-    def _update_info_board(self) -> None:
-        '''Updates the info board with appropriate items.'''
+    def _draw_board(self, num_columns: int, num_rows: int) -> None:
+        '''Draws the game board. The lines are created the first time and
+        are moved to fit the canvas after that.'''
+
+        if len(self._line_items) == 0:
+            for line in range(num_columns + num_rows):
+                self._line_items.append(self.game_board.create_line(0, 0, 0, 0))
+
+        for item, line_coords in zip(self._line_items, self._line_coords):
+            self.game_board.coords(item, *line_coords)
+
+    def _create_tiles(self) -> None:
+        '''Creates a hidden oval for every position on the game board,
+        which _draw_tile shows and colors as the game changes, and a
+        hidden marker and flip count text, which _draw_hint shows on
+        possible moves.'''
+
+        for column in range(1, self.state._get_num_columns() + 1):
+            for row in range(1, self.state._get_num_rows() + 1):
+                self._tile_items[(column, row)] = self.game_board.create_oval(
+                    0, 0, 0, 0, outline = '#000000', state = tkinter.HIDDEN)
+                self._hint_items[(column, row)] = (
+                    self.game_board.create_oval(0, 0, 0, 0, outline = '',
+                        fill = HINT_COLOR, state = tkinter.HIDDEN),
+                    self.game_board.create_text(0, 0, text = '',
+                        fill = '#FFFFFF', font = ('Arial', 9),
+                        state = tkinter.HIDDEN))
+
+        self._place_tiles()
+
+    def _place_tiles(self) -> None:
+        '''Moves every tile oval and possible move marker to fit its
+        position on the canvas.'''
+
+        for position, item in self._tile_items.items():
+            self.game_board.coords(item, *self._tile_boxes[position])
+
+        for position, (marker, text) in self._hint_items.items():
+            left, top, right, bottom = self._tile_boxes[position]
+            width = right - left
+            height = bottom - top
+            self.game_board.coords(marker, left + width * 0.3,
+                top + height * 0.3, right - width * 0.3, bottom - height * 0.3)
+            self.game_board.coords(text, left + width / 2, top + height / 2)
+
+    def _create_info_board(self) -> None:
+        '''Creates the info board labels, which show the text of the
+        turn and score variables that _update_info_board sets.'''
+
+        self.turn_text = tkinter.StringVar(master = self.root_window)
+        self.analysis_text = tkinter.StringVar(master = self.root_window,
+            value = "Press 'a' to analyze")
+        self.white_score_text = tkinter.StringVar(master = self.root_window)
+        self.black_score_text = tkinter.StringVar(master = self.root_window)
 
         whose_turn = tkinter.Label(
             master = self.info_board,
-            text = 'Turn: ' + self.state.get_string_turn(),
+            textvariable = self.turn_text,
             font = ('Arial', 12),
             height = 1)
 
@@ -107,7 +203,7 @@ class OthelloGui:
 
         white_score = tkinter.Label(
             master = self.info_board,
-            text = 'White: ' + str(self.state.get_score()[0]),
+            textvariable = self.white_score_text,
             font = ('Arial', 12),
             height = 1)
 
@@ -117,7 +213,7 @@ class OthelloGui:
 
         black_score = tkinter.Label(
             master = self.info_board,
-            text = 'Black: ' + str(self.state.get_score()[1]),
+            textvariable = self.black_score_text,
             font = ('Arial', 12),
             height = 1)
 
@@ -125,11 +221,55 @@ class OthelloGui:
             row = 0, column = 2, padx = 10, pady = 10,
             sticky = tkinter.N + tkinter.S + tkinter.E + tkinter.W)
 
+        analysis = tkinter.Label(
+            master = self.info_board,
+            textvariable = self.analysis_text,
+            font = ('Arial', 10),
+            height = 1)
+
+        analysis.grid(
+            row = 1, column = 0, columnspan = 3, padx = 10, pady = 0,
+            sticky = tkinter.N + tkinter.S + tkinter.E + tkinter.W)
+
         self.info_board.rowconfigure(0, weight = 0)
+        self.info_board.rowconfigure(1, weight = 0)
         self.info_board.columnconfigure(0, weight = 1)
         self.info_board.columnconfigure(1, weight = 1)
         self.info_board.columnconfigure(2, weight = 1)
 
+    def _update_info_board(self) -> None:
+        '''Updates the info board with the current turn and score.'''
+
+        score = self.state.get_score()
+
+        self.turn_text.set('Turn: ' + self.state.get_string_turn())
+        self.white_score_text.set('White: ' + str(score[0]))
+        self.black_score_text.set('Black: ' + str(score[1]))
+
+    def get_ui_stats(self) -> dict:
+        '''Returns the number of tkinter widgets in the application and
+        the number of items on the game board canvas.'''
+
+        widget_count = 0
+        widgets = [self.root_window]
+
+        while len(widgets) > 0:
+            widget = widgets.pop()
+            widget_count += 1
+            widgets.extend(widget.winfo_children())
+
+        return {'widget_count': widget_count,
+                'canvas_item_count': len(self.game_board.find_all())}
+
+    def _report_ui_update(self, seconds: float) -> None:
+        '''Passes the UI stats and the time a UI update took to the
+        on_ui_update hook, if there is one.'''
+
+        if self.on_ui_update is not None:
+            ui_stats = self.get_ui_stats()
+            ui_stats['update_seconds'] = seconds
+            self.on_ui_update(ui_stats)
+
     def _on_click(self, event: tkinter.Event) -> None:
         '''Draws a tile on the game board when the board is clicked.
         Also, manages the players turn, by checking if the next player
@@ -142,36 +282,90 @@ class OthelloGui:
         column = int(event.x/self.column_pixel_size) + 1
         row = int(event.y/self.row_pixel_size) + 1
 
-        try:
-            self.state.execute_move((column, row))
-            self._draw_tiles_from_game_state()
-            self._manage_turn()
-        except othello.InvalidMoveError:
+        if (column, row) not in self._move_hints:
             invalid_move_dialog_window = othello_gui_dialog_boxes.InvalidMoveDialog(
                 self.root_window)
             invalid_move_dialog_window.show()
-            
+            return
+
+        start = time.perf_counter()
+        record = self.state.make_move((column, row))
+        self._cancel_analysis()
+        self._draw_tile(column, row, self.state._return_tile(column, row))
+        for tile in record[1]:
+            self._draw_tile(tile[0], tile[1],
+                self.state._return_tile(tile[0], tile[1]))
+        self._manage_turn(start)
+
 
     def _draw_tile(self, column: int, row: int, tile_type: str) -> None:
-        '''Draws a tile on the game board given a column and row number.'''
-        
-        radius_x = self.column_pixel_size/2
-        radius_y = self.row_pixel_size/2
+        '''Draws a tile on the game board given a column and row number,
+        by recoloring the oval at that position.'''
 
-        center_x = (self.column_pixel_size * (column - 1)) + radius_x
-        center_y = (self.row_pixel_size * (row - 1)) + radius_y
+        item = self._tile_items[(column, row)]
 
         if tile_type == 'W':
-            color = '#FFFFFF'        
+            color = '#FFFFFF'
         if tile_type == 'B':
             color = '#000000'
         if tile_type == '-':
+            self.game_board.itemconfigure(item, state = tkinter.HIDDEN)
             return
-            
-        self.game_board.create_oval(
-            center_x - radius_x, center_y - radius_y,
-            center_x + radius_x, center_y + radius_y,
-            fill = color, outline = '#000000') 
+
+        self.game_board.itemconfigure(item, fill = color,
+            state = tkinter.NORMAL)
+
+    def _update_move_hints(self) -> None:
+        '''Gets the possible moves of the current player and the number of
+        tiles each flips, once per turn, and redraws the markers of the
+        positions that changed. The click handler checks moves against
+        the same table.'''
+
+        old_hints = self._move_hints
+        self._move_hints = self.state.get_flip_counts()
+
+        for move in set(old_hints) | set(self._move_hints):
+            self._draw_hint(move)
+
+    def _draw_hint(self, move: tuple) -> None:
+        '''Shows the marker and flip count of a possible move when the
+        possible moves are shown, or the best move hint if move is the
+        best move found by the analysis, and hides them otherwise.'''
+
+        marker, text = self._hint_items[move]
+
+        if move == self._best_move:
+            color = BEST_MOVE_COLOR
+        elif self.show_moves and move in self._move_hints:
+            color = HINT_COLOR
+        else:
+            self.game_board.itemconfigure(marker, state = tkinter.HIDDEN)
+            self.game_board.itemconfigure(text, state = tkinter.HIDDEN)
+            return
+
+        self.game_board.itemconfigure(marker, fill = color,
+            state = tkinter.NORMAL)
+        self.game_board.itemconfigure(text,
+            text = str(self._move_hints.get(move, '')), state = tkinter.NORMAL)
+
+    def _set_best_move(self, move: tuple) -> None:
+        '''Moves the best move hint to move, or removes it if move is
+        None.'''
+
+        old_move = self._best_move
+        self._best_move = move
+
+        for hint_move in (old_move, move):
+            if hint_move is not None:
+                self._draw_hint(hint_move)
+
+    def _on_toggle_moves(self, event: tkinter.Event) -> None:
+        '''Shows or hides the possible move markers.'''
+
+        self.show_moves = not self.show_moves
+
+        for move in self._move_hints:
+            self._draw_hint(move)
 
     def _draw_tiles_from_game_state(self) -> None:
         '''Draws tiles on the board from the game state data.'''
@@ -190,24 +384,92 @@ class OthelloGui:
             row_index = 0
                 
     def _on_resize(self, event: tkinter.Event) -> None:
-        '''Redraws the canvas when the window is resized.'''
+        '''Schedules a redraw when the window is resized. Resize events
+        which arrive before the scheduled redraw runs are coalesced into
+        it, so the board is redrawn at most once per REDRAW_INTERVAL.
+        Also cancels any running analysis.'''
 
-        self.game_board.delete(tkinter.ALL)
-        self._draw_board(self.state._get_num_columns(),
-            self.state._get_num_rows())
-        self._draw_tiles_from_game_state()
+        self._cancel_analysis()
+
+        if self._redraw_id is None:
+            self._redraw_id = self.root_window.after(REDRAW_INTERVAL,
+                                                     self._redraw)
+
+    def _redraw(self) -> None:
+        '''Moves the board lines and tiles to fit the canvas, if its size
+        has changed since the last redraw.'''
+
+        self._redraw_id = None
+
+        if self._compute_geometry():
+            self._draw_board(self.state._get_num_columns(),
+                self.state._get_num_rows())
+            self._place_tiles()
+
+    def _on_analyze(self, event: tkinter.Event) -> None:
+        '''Starts searching for the best move of the current player in
+        the background.'''
+
+        self.analysis_text.set('Analyzing...')
+        self.worker.submit(self.state, ANALYSIS_TIME_LIMIT,
+            self._on_analysis_progress, self._on_analysis_done)
+
+    def _on_analysis_progress(self, progress: dict) -> None:
+        '''Shows the best move found so far and the depth reached.'''
+
+        self.analysis_text.set('Best move so far: {} (depth {})'.format(
+            progress['move'], progress['depth']))
+        self._set_best_move(progress['move'])
+
+    def _on_analysis_done(self, move: tuple) -> None:
+        '''Shows the best move found by the finished analysis.'''
+
+        if move is None:
+            self.analysis_text.set('No possible moves')
+        else:
+            self.analysis_text.set('Best move: {}'.format(move))
+        self._set_best_move(move)
+
+    def _cancel_analysis(self) -> None:
+        '''Stops any running analysis, as its result no longer applies.'''
+
+        if self.worker.is_busy():
+            self.worker.cancel()
+            self.analysis_text.set("Press 'a' to analyze")
+        self._set_best_move(None)
+
+    def _on_close(self) -> None:
+        '''Stops any running analysis and the worker thread before
+        closing the window, so the program does not wait for the search
+        to finish when it exits.'''
+
+        self.worker.shutdown()
+        self.root_window.destroy()
+
+    def _manage_turn(self, start: float) -> None:
+        '''Manages turn related verifications and state updates. start
+        is when the UI update for the move began.'''
+
+        game_over = False
 
-    def _manage_turn(self) -> None:
-        '''Manages turn related verifications and state updates.'''
-              
         if self.state.check_if_player_can_move() == False:
             if self.state.check_if_game_over() == True:
-                winner_dialog_window = othello_gui_dialog_boxes.WinDialog(
-                    self.root_window, self.state.return_winner())
-                winner_dialog_window.show()
-                
+                game_over = True
+
+        self._update_move_hints()
         self._update_info_board()
+        self._report_ui_update(time.perf_counter() - start)
+
+        if game_over:
+            winner_dialog_window = othello_gui_dialog_boxes.WinDialog(
+                self.root_window, self.state.return_winner())
+            winner_dialog_window.show()
             
 if __name__ == '__main__':
 
-    OthelloGui().start()
+    parser = argparse.ArgumentParser(description = 'Plays Othello.')
+    parser.add_argument('--engine', default = 'list',
+                        choices = sorted(othello_engine.ENGINES))
+    args = parser.parse_args()
+
+    OthelloGui(engine = args.engine).start()
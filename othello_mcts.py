@@ -0,0 +1,362 @@
+import math
+import multiprocessing
+import random
+import time
+import othello
+import othello_bitboard
+import othello_position
+
+# Default UCT exploration constant.
+EXPLORATION = 1.4
+
+# Chance that a playout takes a corner when one is possible under the
+# 'MOST' win type, or avoids corners when it can under 'LEAST'.
+CORNER_BIAS = 0.5
+
+class Node:
+    '''One position in the search tree. wins counts the playouts won by
+    mover, the player who moved into the position, with a tie counted as
+    half a win. untried holds the moves not yet expanded, where None is
+    a pass.'''
+
+    __slots__ = ('position', 'move', 'parent', 'children', 'untried',
+                 'visits', 'wins', 'mover')
+
+    def __init__(self, position: 'Position', move: tuple, parent: 'Node'):
+        '''Creates a Node for position, reached by move from parent.'''
+
+        self.position = position
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.visits = 0
+        self.wins = 0.0
+        self.mover = -position.player_turn
+
+        self.untried = position.get_possible_moves()
+        if len(self.untried) == 0 and not position.check_if_game_over():
+            self.untried = [None]
+
+    def select_child(self, exploration: float) -> 'Node':
+        '''Returns the child with the highest UCT value.'''
+
+        log_visits = math.log(self.visits)
+        return max(self.children, key = lambda child:
+                   child.wins / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+class MCTSSearch:
+    '''Monte Carlo tree search over othello_position.Positions in one
+    process. The tree is kept between searches, so when the next search
+    starts from a position a move or two below the last root, that part
+    of the tree is reused.'''
+
+    def __init__(self, exploration: float = EXPLORATION,
+                 corner_bias: float = CORNER_BIAS, seed: int = None):
+        '''Creates an MCTSSearch with a UCT exploration constant and the
+        corner bias of its playouts.'''
+
+        self.exploration = exploration
+        self.corner_bias = corner_bias
+        self._random = random.Random(seed)
+        self._root = None
+        self._playout_game = None
+        self._corners = 0
+
+    def search(self, position: 'Position', time_limit: float = None,
+               playouts: int = None, added_only: bool = False) -> tuple:
+        '''Searches position until time_limit seconds have passed or
+        playouts playouts have been run, whichever comes first; at least
+        one of them must be given. Returns (statistics, playouts run),
+        where statistics maps each root move to (visits, wins) for the
+        player to move. If added_only is True the visits and wins kept
+        from earlier searches are left out of statistics.'''
+
+        root = self._return_root(position)
+        kept = {}
+        if added_only:
+            kept = {child.move: (child.visits, child.wins)
+                    for child in root.children}
+        self._prepare_playouts(position)
+        deadline = None
+        if time_limit is not None:
+            deadline = time.perf_counter() + time_limit
+        count = 0
+
+        while playouts is None or count < playouts:
+            if deadline is not None and count & 15 == 0:
+                if time.perf_counter() > deadline:
+                    break
+            self._run_playout(root)
+            count += 1
+
+        statistics = {}
+        for child in root.children:
+            kept_visits, kept_wins = kept.get(child.move, (0, 0.0))
+            if child.visits > kept_visits:
+                statistics[child.move] = (child.visits - kept_visits,
+                                          child.wins - kept_wins)
+
+        return (statistics, count)
+
+    def _return_root(self, position: 'Position') -> Node:
+        '''Returns the node for position from the kept tree if it is the
+        root or up to three moves below it, otherwise a new node. The
+        node found becomes the root of the tree.'''
+
+        nodes = []
+        if self._root is not None:
+            nodes.append(self._root)
+
+        for depth in range(4):
+            for node in nodes:
+                if node.position == position:
+                    node.parent = None
+                    self._root = node
+                    return node
+            nodes = [child for node in nodes for child in node.children]
+
+        self._root = Node(position, None, None)
+        return self._root
+
+    def _run_playout(self, root: Node) -> None:
+        '''Selects a leaf with UCT, expands one move there, plays the game
+        out at random and updates the nodes on the path.'''
+
+        node = root
+
+        while len(node.untried) == 0 and len(node.children) > 0:
+            node = node.select_child(self.exploration)
+
+        if len(node.untried) > 0:
+            move = node.untried.pop(self._random.randrange(len(node.untried)))
+            if move is None:
+                position = node.position.pass_turn()
+            else:
+                position = node.position.play(move)
+            child = Node(position, move, node)
+            node.children.append(child)
+            node = child
+
+        winner = self._play_out(node.position)
+
+        while node is not None:
+            node.visits += 1
+            if winner == 0:
+                node.wins += 0.5
+            elif winner == node.mover:
+                node.wins += 1
+            node = node.parent
+
+    def _prepare_playouts(self, position: 'Position') -> None:
+        '''Sets up the bitboard game used for playouts on the board size
+        of position.'''
+
+        game = self._playout_game
+        if (game is None or game.columns != position.columns
+            or game.rows != position.rows):
+            game = othello_bitboard.BitboardOthelloGame(position.columns,
+                position.rows, 'WHITE', 'MOST', 'WHITE')
+            self._playout_game = game
+            self._corners = 0
+            for move in [(1, 1), (1, position.rows), (position.columns, 1),
+                         (position.columns, position.rows)]:
+                self._corners |= game._to_bit(move)
+        game.win_condition = position.win_condition
+
+    def _play_out(self, position: 'Position') -> int:
+        '''Plays random moves from position until the game is over and
+        returns the winner: 1 for WHITE, -1 for BLACK and 0 for a tie.
+        Corners are taken, or under 'LEAST' avoided, with probability
+        corner_bias.'''
+
+        game = self._playout_game
+        game.white, game.black = _return_bitboards(position)
+        game.player_turn = position.player_turn
+        corners = self._corners
+        least = game.win_condition == 'LEAST'
+        rng = self._random
+        passed = False
+
+        while True:
+            mask = game._return_move_mask()
+            if mask == 0:
+                if passed:
+                    break
+                passed = True
+                game.player_turn = -game.player_turn
+                continue
+            passed = False
+
+            if mask & corners and rng.random() < self.corner_bias:
+                if not least:
+                    mask &= corners
+                elif mask & ~corners:
+                    mask &= ~corners
+
+            bits = []
+            while mask:
+                low_bit = mask & -mask
+                bits.append(low_bit)
+                mask ^= low_bit
+            bit = bits[rng.randrange(len(bits))]
+
+            flips = game._return_flips(bit)
+            if game.player_turn == 1:
+                game.white |= bit | flips
+                game.black &= ~flips
+            else:
+                game.black |= bit | flips
+                game.white &= ~flips
+            game.player_turn = -game.player_turn
+
+        difference = game.white.bit_count() - game.black.bit_count()
+        if least:
+            difference = -difference
+        return (difference > 0) - (difference < 0)
+
+class MCTSPlayer:
+    '''Computer player which chooses moves with Monte Carlo tree search.
+    It needs no evaluation function, so it plays every board size and
+    win type. With more than one process, each searcher process keeps
+    its own tree, reused between moves, and searches it for the same
+    time (root parallelism); the visits each adds to the root moves are
+    added up.'''
+
+    def __init__(self, time_limit: float = 1.0, playouts: int = None,
+                 processes: int = 1, exploration: float = EXPLORATION,
+                 corner_bias: float = CORNER_BIAS, seed: int = None):
+        '''Creates an MCTSPlayer which spends time_limit seconds or runs
+        playouts playouts on each move, whichever ends first. Either may
+        be None, but not both. With processes above 1, the searcher
+        processes are started on the first move; call close to stop
+        them.'''
+
+        if time_limit is None and playouts is None:
+            raise ValueError('a time limit or a playout budget is needed')
+
+        self.time_limit = time_limit
+        self.playout_budget = playouts
+        self.processes = processes
+        self.exploration = exploration
+        self.corner_bias = corner_bias
+        self.seed = seed
+        self.playouts = 0
+        self.seconds = 0.0
+        self.playouts_per_second = 0.0
+        self._search = MCTSSearch(exploration, corner_bias, seed)
+        self._searchers = []
+
+    def choose_move(self, game: othello.OthelloGame) -> tuple:
+        '''Returns the most visited move for the current player of game,
+        or None if the current player has no possible moves.'''
+
+        position = othello_position.Position.from_game(game)
+        moves = position.get_possible_moves()
+
+        if len(moves) == 0:
+            return None
+
+        start = time.perf_counter()
+
+        if self.processes == 1:
+            statistics, self.playouts = self._search.search(position,
+                self.time_limit, self.playout_budget)
+        else:
+            statistics, self.playouts = self._search_in_processes(position)
+
+        self.seconds = time.perf_counter() - start
+        self.playouts_per_second = self.playouts / max(self.seconds, 1e-9)
+
+        if len(statistics) == 0:
+            return moves[0]
+        return max(statistics, key = lambda move: statistics[move][0])
+
+    def close(self) -> None:
+        '''Stops the searcher processes, if they were started.'''
+
+        for process, connection in self._searchers:
+            connection.send(None)
+            connection.close()
+            process.join()
+        self._searchers = []
+
+    def _search_in_processes(self, position: 'Position') -> tuple:
+        '''Runs one search in each searcher process and returns the added
+        up (statistics, playouts run).'''
+
+        if len(self._searchers) == 0:
+            for index in range(self.processes):
+                seed = None
+                if self.seed is not None:
+                    seed = self.seed + index * 7919
+                connection, child_connection = multiprocessing.Pipe()
+                process = multiprocessing.Process(target = _run_searcher,
+                    args = (child_connection, self.exploration,
+                            self.corner_bias, seed), daemon = True)
+                process.start()
+                child_connection.close()
+                self._searchers.append((process, connection))
+
+        playouts = None
+        if self.playout_budget is not None:
+            playouts = -(-self.playout_budget // self.processes)
+
+        for process, connection in self._searchers:
+            connection.send((position, self.time_limit, playouts))
+
+        statistics = {}
+        total_playouts = 0
+        for process, connection in self._searchers:
+            job_statistics, job_playouts = connection.recv()
+            total_playouts += job_playouts
+            for move, (visits, wins) in job_statistics.items():
+                old_visits, old_wins = statistics.get(move, (0, 0.0))
+                statistics[move] = (old_visits + visits, old_wins + wins)
+
+        return (statistics, total_playouts)
+
+
+#FUNCTIONS USED BY THE MCTS PLAYER:
+
+def _run_searcher(connection: 'Connection', exploration: float,
+                  corner_bias: float, seed: int) -> None:
+    '''Runs in a searcher process. Keeps one MCTSSearch, so its tree is
+    reused between moves, and answers each (position, time limit,
+    playouts) request on connection with (statistics, playouts run),
+    counting only the visits added by that search, until it receives
+    None.'''
+
+    search = MCTSSearch(exploration, corner_bias, seed)
+
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        position, time_limit, playouts = request
+        connection.send(search.search(position, time_limit, playouts,
+                                      added_only = True))
+
+    connection.close()
+
+def _return_bitboards(position: 'Position') -> tuple:
+    '''Returns (white, black) bitboards of position, with the bit
+    (row - 1) * columns + (column - 1) for each tile as in
+    othello_bitboard.'''
+
+    columns = position.columns
+    board = position._board
+    white = 0
+    black = 0
+    bit = 1
+
+    for row in range(1, position.rows + 1):
+        row_start = row * (columns + 2) + 1
+        for tile in board[row_start:row_start + columns]:
+            if tile == othello_position.WHITE:
+                white |= bit
+            elif tile == othello_position.BLACK:
+                black |= bit
+            bit <<= 1
+
+    return (white, black)
@@ -0,0 +1,460 @@
+import argparse
+import sys
+import time
+import othello_engine
+
+# Leaf counts from the begin_game position with BLACK moving first, keyed
+# by (columns, rows, center tile). Each list holds the counts for depths
+# 1, 2, 3, ... The 8x8 'WHITE' counts match the published perft values
+# for standard Othello; the rest were generated by this tool and agree
+# between the list and bitboard engines.
+REFERENCE_COUNTS = {
+    (4, 4, 'WHITE'): [4, 12, 44, 128, 424],
+    (4, 4, 'BLACK'): [4, 12, 44, 128, 424],
+    (4, 5, 'WHITE'): [4, 12, 47, 154, 611],
+    (4, 5, 'BLACK'): [4, 12, 47, 154, 611],
+    (4, 6, 'WHITE'): [4, 12, 50, 180, 798],
+    (4, 6, 'BLACK'): [4, 12, 50, 180, 798],
+    (4, 7, 'WHITE'): [4, 12, 50, 180, 803],
+    (4, 7, 'BLACK'): [4, 12, 50, 180, 803],
+    (4, 8, 'WHITE'): [4, 12, 50, 180, 808],
+    (4, 8, 'BLACK'): [4, 12, 50, 180, 808],
+    (4, 9, 'WHITE'): [4, 12, 50, 180, 808],
+    (4, 9, 'BLACK'): [4, 12, 50, 180, 808],
+    (4, 10, 'WHITE'): [4, 12, 50, 180, 808],
+    (4, 10, 'BLACK'): [4, 12, 50, 180, 808],
+    (4, 11, 'WHITE'): [4, 12, 50, 180, 808],
+    (4, 11, 'BLACK'): [4, 12, 50, 180, 808],
+    (4, 12, 'WHITE'): [4, 12, 50, 180, 808],
+    (4, 12, 'BLACK'): [4, 12, 50, 180, 808],
+    (4, 13, 'WHITE'): [4, 12, 50, 180, 808],
+    (4, 13, 'BLACK'): [4, 12, 50, 180, 808],
+    (4, 14, 'WHITE'): [4, 12, 50, 180, 808],
+    (4, 14, 'BLACK'): [4, 12, 50, 180, 808],
+    (4, 15, 'WHITE'): [4, 12, 50, 180, 808],
+    (4, 15, 'BLACK'): [4, 12, 50, 180, 808],
+    (4, 16, 'WHITE'): [4, 12, 50, 180, 808],
+    (4, 16, 'BLACK'): [4, 12, 50, 180, 808],
+    (5, 4, 'WHITE'): [4, 12, 47, 154, 611],
+    (5, 4, 'BLACK'): [4, 12, 47, 154, 611],
+    (5, 5, 'WHITE'): [4, 12, 50, 186, 866],
+    (5, 5, 'BLACK'): [4, 12, 50, 180, 826],
+    (5, 6, 'WHITE'): [4, 12, 53, 212, 1081],
+    (5, 6, 'BLACK'): [4, 12, 53, 212, 1081],
+    (5, 7, 'WHITE'): [4, 12, 53, 212, 1089],
+    (5, 7, 'BLACK'): [4, 12, 53, 212, 1086],
+    (5, 8, 'WHITE'): [4, 12, 53, 212, 1094],
+    (5, 8, 'BLACK'): [4, 12, 53, 212, 1094],
+    (5, 9, 'WHITE'): [4, 12, 53, 212, 1094],
+    (5, 9, 'BLACK'): [4, 12, 53, 212, 1094],
+    (5, 10, 'WHITE'): [4, 12, 53, 212, 1094],
+    (5, 10, 'BLACK'): [4, 12, 53, 212, 1094],
+    (5, 11, 'WHITE'): [4, 12, 53, 212, 1094],
+    (5, 11, 'BLACK'): [4, 12, 53, 212, 1094],
+    (5, 12, 'WHITE'): [4, 12, 53, 212, 1094],
+    (5, 12, 'BLACK'): [4, 12, 53, 212, 1094],
+    (5, 13, 'WHITE'): [4, 12, 53, 212, 1094],
+    (5, 13, 'BLACK'): [4, 12, 53, 212, 1094],
+    (5, 14, 'WHITE'): [4, 12, 53, 212, 1094],
+    (5, 14, 'BLACK'): [4, 12, 53, 212, 1094],
+    (5, 15, 'WHITE'): [4, 12, 53, 212, 1094],
+    (5, 15, 'BLACK'): [4, 12, 53, 212, 1094],
+    (5, 16, 'WHITE'): [4, 12, 53, 212, 1094],
+    (5, 16, 'BLACK'): [4, 12, 53, 212, 1094],
+    (6, 4, 'WHITE'): [4, 12, 50, 180, 798],
+    (6, 4, 'BLACK'): [4, 12, 50, 180, 798],
+    (6, 5, 'WHITE'): [4, 12, 53, 212, 1081],
+    (6, 5, 'BLACK'): [4, 12, 53, 212, 1081],
+    (6, 6, 'WHITE'): [4, 12, 56, 244, 1364],
+    (6, 6, 'BLACK'): [4, 12, 56, 244, 1364],
+    (6, 7, 'WHITE'): [4, 12, 56, 244, 1372],
+    (6, 7, 'BLACK'): [4, 12, 56, 244, 1372],
+    (6, 8, 'WHITE'): [4, 12, 56, 244, 1380],
+    (6, 8, 'BLACK'): [4, 12, 56, 244, 1380],
+    (6, 9, 'WHITE'): [4, 12, 56, 244, 1380],
+    (6, 9, 'BLACK'): [4, 12, 56, 244, 1380],
+    (6, 10, 'WHITE'): [4, 12, 56, 244, 1380],
+    (6, 10, 'BLACK'): [4, 12, 56, 244, 1380],
+    (6, 11, 'WHITE'): [4, 12, 56, 244, 1380],
+    (6, 11, 'BLACK'): [4, 12, 56, 244, 1380],
+    (6, 12, 'WHITE'): [4, 12, 56, 244, 1380],
+    (6, 12, 'BLACK'): [4, 12, 56, 244, 1380],
+    (6, 13, 'WHITE'): [4, 12, 56, 244, 1380],
+    (6, 13, 'BLACK'): [4, 12, 56, 244, 1380],
+    (6, 14, 'WHITE'): [4, 12, 56, 244, 1380],
+    (6, 14, 'BLACK'): [4, 12, 56, 244, 1380],
+    (6, 15, 'WHITE'): [4, 12, 56, 244, 1380],
+    (6, 15, 'BLACK'): [4, 12, 56, 244, 1380],
+    (6, 16, 'WHITE'): [4, 12, 56, 244, 1380],
+    (6, 16, 'BLACK'): [4, 12, 56, 244, 1380],
+    (7, 4, 'WHITE'): [4, 12, 50, 180, 803],
+    (7, 4, 'BLACK'): [4, 12, 50, 180, 803],
+    (7, 5, 'WHITE'): [4, 12, 53, 212, 1089],
+    (7, 5, 'BLACK'): [4, 12, 53, 212, 1086],
+    (7, 6, 'WHITE'): [4, 12, 56, 244, 1372],
+    (7, 6, 'BLACK'): [4, 12, 56, 244, 1372],
+    (7, 7, 'WHITE'): [4, 12, 56, 244, 1380],
+    (7, 7, 'BLACK'): [4, 12, 56, 244, 1380],
+    (7, 8, 'WHITE'): [4, 12, 56, 244, 1388],
+    (7, 8, 'BLACK'): [4, 12, 56, 244, 1388],
+    (7, 9, 'WHITE'): [4, 12, 56, 244, 1388],
+    (7, 9, 'BLACK'): [4, 12, 56, 244, 1388],
+    (7, 10, 'WHITE'): [4, 12, 56, 244, 1388],
+    (7, 10, 'BLACK'): [4, 12, 56, 244, 1388],
+    (7, 11, 'WHITE'): [4, 12, 56, 244, 1388],
+    (7, 11, 'BLACK'): [4, 12, 56, 244, 1388],
+    (7, 12, 'WHITE'): [4, 12, 56, 244, 1388],
+    (7, 12, 'BLACK'): [4, 12, 56, 244, 1388],
+    (7, 13, 'WHITE'): [4, 12, 56, 244, 1388],
+    (7, 13, 'BLACK'): [4, 12, 56, 244, 1388],
+    (7, 14, 'WHITE'): [4, 12, 56, 244, 1388],
+    (7, 14, 'BLACK'): [4, 12, 56, 244, 1388],
+    (7, 15, 'WHITE'): [4, 12, 56, 244, 1388],
+    (7, 15, 'BLACK'): [4, 12, 56, 244, 1388],
+    (7, 16, 'WHITE'): [4, 12, 56, 244, 1388],
+    (7, 16, 'BLACK'): [4, 12, 56, 244, 1388],
+    (8, 4, 'WHITE'): [4, 12, 50, 180, 808],
+    (8, 4, 'BLACK'): [4, 12, 50, 180, 808],
+    (8, 5, 'WHITE'): [4, 12, 53, 212, 1094],
+    (8, 5, 'BLACK'): [4, 12, 53, 212, 1094],
+    (8, 6, 'WHITE'): [4, 12, 56, 244, 1380],
+    (8, 6, 'BLACK'): [4, 12, 56, 244, 1380],
+    (8, 7, 'WHITE'): [4, 12, 56, 244, 1388],
+    (8, 7, 'BLACK'): [4, 12, 56, 244, 1388],
+    (8, 8, 'WHITE'): [4, 12, 56, 244, 1396, 8200, 55092, 390216],
+    (8, 8, 'BLACK'): [4, 12, 56, 244, 1396],
+    (8, 9, 'WHITE'): [4, 12, 56, 244, 1396],
+    (8, 9, 'BLACK'): [4, 12, 56, 244, 1396],
+    (8, 10, 'WHITE'): [4, 12, 56, 244, 1396],
+    (8, 10, 'BLACK'): [4, 12, 56, 244, 1396],
+    (8, 11, 'WHITE'): [4, 12, 56, 244, 1396],
+    (8, 11, 'BLACK'): [4, 12, 56, 244, 1396],
+    (8, 12, 'WHITE'): [4, 12, 56, 244, 1396],
+    (8, 12, 'BLACK'): [4, 12, 56, 244, 1396],
+    (8, 13, 'WHITE'): [4, 12, 56, 244, 1396],
+    (8, 13, 'BLACK'): [4, 12, 56, 244, 1396],
+    (8, 14, 'WHITE'): [4, 12, 56, 244, 1396],
+    (8, 14, 'BLACK'): [4, 12, 56, 244, 1396],
+    (8, 15, 'WHITE'): [4, 12, 56, 244, 1396],
+    (8, 15, 'BLACK'): [4, 12, 56, 244, 1396],
+    (8, 16, 'WHITE'): [4, 12, 56, 244, 1396],
+    (8, 16, 'BLACK'): [4, 12, 56, 244, 1396],
+    (9, 4, 'WHITE'): [4, 12, 50, 180, 808],
+    (9, 4, 'BLACK'): [4, 12, 50, 180, 808],
+    (9, 5, 'WHITE'): [4, 12, 53, 212, 1094],
+    (9, 5, 'BLACK'): [4, 12, 53, 212, 1094],
+    (9, 6, 'WHITE'): [4, 12, 56, 244, 1380],
+    (9, 6, 'BLACK'): [4, 12, 56, 244, 1380],
+    (9, 7, 'WHITE'): [4, 12, 56, 244, 1388],
+    (9, 7, 'BLACK'): [4, 12, 56, 244, 1388],
+    (9, 8, 'WHITE'): [4, 12, 56, 244, 1396],
+    (9, 8, 'BLACK'): [4, 12, 56, 244, 1396],
+    (9, 9, 'WHITE'): [4, 12, 56, 244, 1396],
+    (9, 9, 'BLACK'): [4, 12, 56, 244, 1396],
+    (9, 10, 'WHITE'): [4, 12, 56, 244, 1396],
+    (9, 10, 'BLACK'): [4, 12, 56, 244, 1396],
+    (9, 11, 'WHITE'): [4, 12, 56, 244, 1396],
+    (9, 11, 'BLACK'): [4, 12, 56, 244, 1396],
+    (9, 12, 'WHITE'): [4, 12, 56, 244, 1396],
+    (9, 12, 'BLACK'): [4, 12, 56, 244, 1396],
+    (9, 13, 'WHITE'): [4, 12, 56, 244, 1396],
+    (9, 13, 'BLACK'): [4, 12, 56, 244, 1396],
+    (9, 14, 'WHITE'): [4, 12, 56, 244, 1396],
+    (9, 14, 'BLACK'): [4, 12, 56, 244, 1396],
+    (9, 15, 'WHITE'): [4, 12, 56, 244, 1396],
+    (9, 15, 'BLACK'): [4, 12, 56, 244, 1396],
+    (9, 16, 'WHITE'): [4, 12, 56, 244, 1396],
+    (9, 16, 'BLACK'): [4, 12, 56, 244, 1396],
+    (10, 4, 'WHITE'): [4, 12, 50, 180, 808],
+    (10, 4, 'BLACK'): [4, 12, 50, 180, 808],
+    (10, 5, 'WHITE'): [4, 12, 53, 212, 1094],
+    (10, 5, 'BLACK'): [4, 12, 53, 212, 1094],
+    (10, 6, 'WHITE'): [4, 12, 56, 244, 1380],
+    (10, 6, 'BLACK'): [4, 12, 56, 244, 1380],
+    (10, 7, 'WHITE'): [4, 12, 56, 244, 1388],
+    (10, 7, 'BLACK'): [4, 12, 56, 244, 1388],
+    (10, 8, 'WHITE'): [4, 12, 56, 244, 1396],
+    (10, 8, 'BLACK'): [4, 12, 56, 244, 1396],
+    (10, 9, 'WHITE'): [4, 12, 56, 244, 1396],
+    (10, 9, 'BLACK'): [4, 12, 56, 244, 1396],
+    (10, 10, 'WHITE'): [4, 12, 56, 244, 1396],
+    (10, 10, 'BLACK'): [4, 12, 56, 244, 1396],
+    (10, 11, 'WHITE'): [4, 12, 56, 244, 1396],
+    (10, 11, 'BLACK'): [4, 12, 56, 244, 1396],
+    (10, 12, 'WHITE'): [4, 12, 56, 244, 1396],
+    (10, 12, 'BLACK'): [4, 12, 56, 244, 1396],
+    (10, 13, 'WHITE'): [4, 12, 56, 244, 1396],
+    (10, 13, 'BLACK'): [4, 12, 56, 244, 1396],
+    (10, 14, 'WHITE'): [4, 12, 56, 244, 1396],
+    (10, 14, 'BLACK'): [4, 12, 56, 244, 1396],
+    (10, 15, 'WHITE'): [4, 12, 56, 244, 1396],
+    (10, 15, 'BLACK'): [4, 12, 56, 244, 1396],
+    (10, 16, 'WHITE'): [4, 12, 56, 244, 1396],
+    (10, 16, 'BLACK'): [4, 12, 56, 244, 1396],
+    (11, 4, 'WHITE'): [4, 12, 50, 180, 808],
+    (11, 4, 'BLACK'): [4, 12, 50, 180, 808],
+    (11, 5, 'WHITE'): [4, 12, 53, 212, 1094],
+    (11, 5, 'BLACK'): [4, 12, 53, 212, 1094],
+    (11, 6, 'WHITE'): [4, 12, 56, 244, 1380],
+    (11, 6, 'BLACK'): [4, 12, 56, 244, 1380],
+    (11, 7, 'WHITE'): [4, 12, 56, 244, 1388],
+    (11, 7, 'BLACK'): [4, 12, 56, 244, 1388],
+    (11, 8, 'WHITE'): [4, 12, 56, 244, 1396],
+    (11, 8, 'BLACK'): [4, 12, 56, 244, 1396],
+    (11, 9, 'WHITE'): [4, 12, 56, 244, 1396],
+    (11, 9, 'BLACK'): [4, 12, 56, 244, 1396],
+    (11, 10, 'WHITE'): [4, 12, 56, 244, 1396],
+    (11, 10, 'BLACK'): [4, 12, 56, 244, 1396],
+    (11, 11, 'WHITE'): [4, 12, 56, 244, 1396],
+    (11, 11, 'BLACK'): [4, 12, 56, 244, 1396],
+    (11, 12, 'WHITE'): [4, 12, 56, 244, 1396],
+    (11, 12, 'BLACK'): [4, 12, 56, 244, 1396],
+    (11, 13, 'WHITE'): [4, 12, 56, 244, 1396],
+    (11, 13, 'BLACK'): [4, 12, 56, 244, 1396],
+    (11, 14, 'WHITE'): [4, 12, 56, 244, 1396],
+    (11, 14, 'BLACK'): [4, 12, 56, 244, 1396],
+    (11, 15, 'WHITE'): [4, 12, 56, 244, 1396],
+    (11, 15, 'BLACK'): [4, 12, 56, 244, 1396],
+    (11, 16, 'WHITE'): [4, 12, 56, 244, 1396],
+    (11, 16, 'BLACK'): [4, 12, 56, 244, 1396],
+    (12, 4, 'WHITE'): [4, 12, 50, 180, 808],
+    (12, 4, 'BLACK'): [4, 12, 50, 180, 808],
+    (12, 5, 'WHITE'): [4, 12, 53, 212, 1094],
+    (12, 5, 'BLACK'): [4, 12, 53, 212, 1094],
+    (12, 6, 'WHITE'): [4, 12, 56, 244, 1380],
+    (12, 6, 'BLACK'): [4, 12, 56, 244, 1380],
+    (12, 7, 'WHITE'): [4, 12, 56, 244, 1388],
+    (12, 7, 'BLACK'): [4, 12, 56, 244, 1388],
+    (12, 8, 'WHITE'): [4, 12, 56, 244, 1396],
+    (12, 8, 'BLACK'): [4, 12, 56, 244, 1396],
+    (12, 9, 'WHITE'): [4, 12, 56, 244, 1396],
+    (12, 9, 'BLACK'): [4, 12, 56, 244, 1396],
+    (12, 10, 'WHITE'): [4, 12, 56, 244, 1396],
+    (12, 10, 'BLACK'): [4, 12, 56, 244, 1396],
+    (12, 11, 'WHITE'): [4, 12, 56, 244, 1396],
+    (12, 11, 'BLACK'): [4, 12, 56, 244, 1396],
+    (12, 12, 'WHITE'): [4, 12, 56, 244, 1396],
+    (12, 12, 'BLACK'): [4, 12, 56, 244, 1396],
+    (12, 13, 'WHITE'): [4, 12, 56, 244, 1396],
+    (12, 13, 'BLACK'): [4, 12, 56, 244, 1396],
+    (12, 14, 'WHITE'): [4, 12, 56, 244, 1396],
+    (12, 14, 'BLACK'): [4, 12, 56, 244, 1396],
+    (12, 15, 'WHITE'): [4, 12, 56, 244, 1396],
+    (12, 15, 'BLACK'): [4, 12, 56, 244, 1396],
+    (12, 16, 'WHITE'): [4, 12, 56, 244, 1396],
+    (12, 16, 'BLACK'): [4, 12, 56, 244, 1396],
+    (13, 4, 'WHITE'): [4, 12, 50, 180, 808],
+    (13, 4, 'BLACK'): [4, 12, 50, 180, 808],
+    (13, 5, 'WHITE'): [4, 12, 53, 212, 1094],
+    (13, 5, 'BLACK'): [4, 12, 53, 212, 1094],
+    (13, 6, 'WHITE'): [4, 12, 56, 244, 1380],
+    (13, 6, 'BLACK'): [4, 12, 56, 244, 1380],
+    (13, 7, 'WHITE'): [4, 12, 56, 244, 1388],
+    (13, 7, 'BLACK'): [4, 12, 56, 244, 1388],
+    (13, 8, 'WHITE'): [4, 12, 56, 244, 1396],
+    (13, 8, 'BLACK'): [4, 12, 56, 244, 1396],
+    (13, 9, 'WHITE'): [4, 12, 56, 244, 1396],
+    (13, 9, 'BLACK'): [4, 12, 56, 244, 1396],
+    (13, 10, 'WHITE'): [4, 12, 56, 244, 1396],
+    (13, 10, 'BLACK'): [4, 12, 56, 244, 1396],
+    (13, 11, 'WHITE'): [4, 12, 56, 244, 1396],
+    (13, 11, 'BLACK'): [4, 12, 56, 244, 1396],
+    (13, 12, 'WHITE'): [4, 12, 56, 244, 1396],
+    (13, 12, 'BLACK'): [4, 12, 56, 244, 1396],
+    (13, 13, 'WHITE'): [4, 12, 56, 244, 1396],
+    (13, 13, 'BLACK'): [4, 12, 56, 244, 1396],
+    (13, 14, 'WHITE'): [4, 12, 56, 244, 1396],
+    (13, 14, 'BLACK'): [4, 12, 56, 244, 1396],
+    (13, 15, 'WHITE'): [4, 12, 56, 244, 1396],
+    (13, 15, 'BLACK'): [4, 12, 56, 244, 1396],
+    (13, 16, 'WHITE'): [4, 12, 56, 244, 1396],
+    (13, 16, 'BLACK'): [4, 12, 56, 244, 1396],
+    (14, 4, 'WHITE'): [4, 12, 50, 180, 808],
+    (14, 4, 'BLACK'): [4, 12, 50, 180, 808],
+    (14, 5, 'WHITE'): [4, 12, 53, 212, 1094],
+    (14, 5, 'BLACK'): [4, 12, 53, 212, 1094],
+    (14, 6, 'WHITE'): [4, 12, 56, 244, 1380],
+    (14, 6, 'BLACK'): [4, 12, 56, 244, 1380],
+    (14, 7, 'WHITE'): [4, 12, 56, 244, 1388],
+    (14, 7, 'BLACK'): [4, 12, 56, 244, 1388],
+    (14, 8, 'WHITE'): [4, 12, 56, 244, 1396],
+    (14, 8, 'BLACK'): [4, 12, 56, 244, 1396],
+    (14, 9, 'WHITE'): [4, 12, 56, 244, 1396],
+    (14, 9, 'BLACK'): [4, 12, 56, 244, 1396],
+    (14, 10, 'WHITE'): [4, 12, 56, 244, 1396],
+    (14, 10, 'BLACK'): [4, 12, 56, 244, 1396],
+    (14, 11, 'WHITE'): [4, 12, 56, 244, 1396],
+    (14, 11, 'BLACK'): [4, 12, 56, 244, 1396],
+    (14, 12, 'WHITE'): [4, 12, 56, 244, 1396],
+    (14, 12, 'BLACK'): [4, 12, 56, 244, 1396],
+    (14, 13, 'WHITE'): [4, 12, 56, 244, 1396],
+    (14, 13, 'BLACK'): [4, 12, 56, 244, 1396],
+    (14, 14, 'WHITE'): [4, 12, 56, 244, 1396],
+    (14, 14, 'BLACK'): [4, 12, 56, 244, 1396],
+    (14, 15, 'WHITE'): [4, 12, 56, 244, 1396],
+    (14, 15, 'BLACK'): [4, 12, 56, 244, 1396],
+    (14, 16, 'WHITE'): [4, 12, 56, 244, 1396],
+    (14, 16, 'BLACK'): [4, 12, 56, 244, 1396],
+    (15, 4, 'WHITE'): [4, 12, 50, 180, 808],
+    (15, 4, 'BLACK'): [4, 12, 50, 180, 808],
+    (15, 5, 'WHITE'): [4, 12, 53, 212, 1094],
+    (15, 5, 'BLACK'): [4, 12, 53, 212, 1094],
+    (15, 6, 'WHITE'): [4, 12, 56, 244, 1380],
+    (15, 6, 'BLACK'): [4, 12, 56, 244, 1380],
+    (15, 7, 'WHITE'): [4, 12, 56, 244, 1388],
+    (15, 7, 'BLACK'): [4, 12, 56, 244, 1388],
+    (15, 8, 'WHITE'): [4, 12, 56, 244, 1396],
+    (15, 8, 'BLACK'): [4, 12, 56, 244, 1396],
+    (15, 9, 'WHITE'): [4, 12, 56, 244, 1396],
+    (15, 9, 'BLACK'): [4, 12, 56, 244, 1396],
+    (15, 10, 'WHITE'): [4, 12, 56, 244, 1396],
+    (15, 10, 'BLACK'): [4, 12, 56, 244, 1396],
+    (15, 11, 'WHITE'): [4, 12, 56, 244, 1396],
+    (15, 11, 'BLACK'): [4, 12, 56, 244, 1396],
+    (15, 12, 'WHITE'): [4, 12, 56, 244, 1396],
+    (15, 12, 'BLACK'): [4, 12, 56, 244, 1396],
+    (15, 13, 'WHITE'): [4, 12, 56, 244, 1396],
+    (15, 13, 'BLACK'): [4, 12, 56, 244, 1396],
+    (15, 14, 'WHITE'): [4, 12, 56, 244, 1396],
+    (15, 14, 'BLACK'): [4, 12, 56, 244, 1396],
+    (15, 15, 'WHITE'): [4, 12, 56, 244, 1396],
+    (15, 15, 'BLACK'): [4, 12, 56, 244, 1396],
+    (15, 16, 'WHITE'): [4, 12, 56, 244, 1396],
+    (15, 16, 'BLACK'): [4, 12, 56, 244, 1396],
+    (16, 4, 'WHITE'): [4, 12, 50, 180, 808],
+    (16, 4, 'BLACK'): [4, 12, 50, 180, 808],
+    (16, 5, 'WHITE'): [4, 12, 53, 212, 1094],
+    (16, 5, 'BLACK'): [4, 12, 53, 212, 1094],
+    (16, 6, 'WHITE'): [4, 12, 56, 244, 1380],
+    (16, 6, 'BLACK'): [4, 12, 56, 244, 1380],
+    (16, 7, 'WHITE'): [4, 12, 56, 244, 1388],
+    (16, 7, 'BLACK'): [4, 12, 56, 244, 1388],
+    (16, 8, 'WHITE'): [4, 12, 56, 244, 1396],
+    (16, 8, 'BLACK'): [4, 12, 56, 244, 1396],
+    (16, 9, 'WHITE'): [4, 12, 56, 244, 1396],
+    (16, 9, 'BLACK'): [4, 12, 56, 244, 1396],
+    (16, 10, 'WHITE'): [4, 12, 56, 244, 1396],
+    (16, 10, 'BLACK'): [4, 12, 56, 244, 1396],
+    (16, 11, 'WHITE'): [4, 12, 56, 244, 1396],
+    (16, 11, 'BLACK'): [4, 12, 56, 244, 1396],
+    (16, 12, 'WHITE'): [4, 12, 56, 244, 1396],
+    (16, 12, 'BLACK'): [4, 12, 56, 244, 1396],
+    (16, 13, 'WHITE'): [4, 12, 56, 244, 1396],
+    (16, 13, 'BLACK'): [4, 12, 56, 244, 1396],
+    (16, 14, 'WHITE'): [4, 12, 56, 244, 1396],
+    (16, 14, 'BLACK'): [4, 12, 56, 244, 1396],
+    (16, 15, 'WHITE'): [4, 12, 56, 244, 1396],
+    (16, 15, 'BLACK'): [4, 12, 56, 244, 1396],
+    (16, 16, 'WHITE'): [4, 12, 56, 244, 1396],
+    (16, 16, 'BLACK'): [4, 12, 56, 244, 1396]}
+
+class PerftMismatchError(Exception):
+    pass
+
+def perft(game, depth: int) -> int:
+    '''Returns the number of leaf positions depth moves ahead of the game's
+    current position. A forced pass counts as a move, and a position where
+    neither player can move is a leaf however deep it is.'''
+
+    if depth == 0:
+        return 1
+
+    moves = game.get_possible_moves()
+
+    if len(moves) == 0:
+        game.player_turn = game.player_turn * -1
+        try:
+            if len(game.get_possible_moves()) == 0:
+                return 1
+            return perft(game, depth - 1)
+        finally:
+            game.player_turn = game.player_turn * -1
+
+    if depth == 1:
+        return len(moves)
+
+    leaf_count = 0
+    for move in moves:
+        record = game.make_move(move)
+        leaf_count += perft(game, depth - 1)
+        game.unmake_move(record)
+
+    return leaf_count
+
+def run_perft(engine: str, columns: int, rows: int, center_tile: str,
+              depth: int) -> tuple:
+    '''Runs perft from the begin_game position and returns a tuple of
+    (leaf count, seconds taken).'''
+
+    game = othello_engine.create_game(columns, rows, 'BLACK', 'MOST',
+                                      center_tile, engine)
+    game.begin_game()
+
+    start = time.perf_counter()
+    leaf_count = perft(game, depth)
+    return (leaf_count, time.perf_counter() - start)
+
+def check_reference(engine: str, max_depth: int = None) -> None:
+    '''Runs perft for every configuration in REFERENCE_COUNTS and raises a
+    PerftMismatchError if any count differs from the recorded one.
+    Prints the counts and nodes/sec as it goes.'''
+
+    for (columns, rows, center_tile), counts in sorted(REFERENCE_COUNTS.items()):
+        for depth in range(1, len(counts) + 1):
+            if max_depth is not None and depth > max_depth:
+                break
+            leaf_count, elapsed = run_perft(engine, columns, rows,
+                                            center_tile, depth)
+            _print_result(columns, rows, center_tile, depth, leaf_count,
+                          elapsed)
+            if leaf_count != counts[depth - 1]:
+                raise PerftMismatchError(
+                    '{}x{} {} depth {}: expected {}, counted {}'.format(
+                        columns, rows, center_tile, depth,
+                        counts[depth - 1], leaf_count))
+
+def main(arguments: list = None) -> None:
+    '''Runs perft from the command line. With no size given, checks every
+    recorded reference count.'''
+
+    parser = argparse.ArgumentParser(
+        description = 'Counts Othello move generation leaf nodes.')
+    parser.add_argument('--engine', default = 'list', choices = sorted(othello_engine.ENGINES))
+    parser.add_argument('--depth', type = int, default = None)
+    parser.add_argument('--columns', type = int, default = None)
+    parser.add_argument('--rows', type = int, default = None)
+    parser.add_argument('--center-tile', default = 'WHITE',
+                        choices = ['WHITE', 'BLACK'])
+    args = parser.parse_args(arguments)
+
+    if args.columns is None and args.rows is None:
+        try:
+            check_reference(args.engine, args.depth)
+        except PerftMismatchError as error:
+            print('MISMATCH: ' + str(error), file = sys.stderr)
+            sys.exit(1)
+        print('all reference counts match')
+        return
+
+    columns = args.columns or args.rows
+    rows = args.rows or args.columns
+    for depth in range(1, (args.depth or 6) + 1):
+        leaf_count, elapsed = run_perft(args.engine, columns, rows,
+                                        args.center_tile, depth)
+        _print_result(columns, rows, args.center_tile, depth, leaf_count,
+                      elapsed)
+
+
+#FUNCTIONS USED BY THE PERFT TOOL:
+
+def _print_result(columns: int, rows: int, center_tile: str, depth: int,
+                  leaf_count: int, elapsed: float) -> None:
+    '''Prints one perft result with its nodes per second.'''
+
+    print('{}x{} {} depth {}: {} leaves in {:.3f}s ({:.0f} nodes/sec)'.format(
+        columns, rows, center_tile, depth, leaf_count, elapsed,
+        leaf_count / max(elapsed, 1e-9)))
+
+if __name__ == '__main__':
+
+    main()
@@ -0,0 +1,259 @@
+import othello
+
+# Each square of the board is one byte holding the ASCII code of its
+# othello tile, in the same padded layout as OthelloGame._cells, so a
+# game's cells can be copied in with one join and encode.
+WHITE = ord(othello.WHITE)
+BLACK = ord(othello.BLACK)
+NONE = ord(othello.NONE)
+BORDER = ord(othello.BORDER)
+
+# Bits of the packed metadata.
+BLACK_TO_MOVE_FLAG = 1
+WIN_TYPE_LEAST_FLAG = 2
+CENTER_TILE_BLACK_FLAG = 4
+
+class Position:
+    '''A compact Othello position: one bytearray board and an int of
+    packed metadata (whose turn it is, the win type and the center tile).
+    Positions are treated as immutable. play and pass_turn return new
+    positions, so cloning is a single copy of the board and positions can
+    be shared, hashed and used as dictionary keys.'''
+
+    __slots__ = ('columns', 'rows', '_board', '_flags', '_hash')
+
+    def __init__(self, columns: int, rows: int, board: bytearray, flags: int):
+        '''Creates a Position from a padded board and packed metadata.
+        Use from_game or begin to create positions.'''
+
+        self.columns = columns
+        self.rows = rows
+        self._board = board
+        self._flags = flags
+        self._hash = None
+
+    @classmethod
+    def begin(cls, columns: int, rows: int, first_player: str,
+              win_type: str, center_tile: str) -> 'Position':
+        '''Returns the begin_game position of an othello.OthelloGame with
+        these settings.'''
+
+        game = othello.OthelloGame(columns, rows, first_player, win_type,
+                                   center_tile)
+        game.begin_game()
+        return cls.from_game(game)
+
+    @classmethod
+    def from_game(cls, game: othello.OthelloGame) -> 'Position':
+        '''Returns the Position of an othello.OthelloGame, or of any game
+        with the same interface.'''
+
+        columns = game._get_num_columns()
+        rows = game._get_num_rows()
+        cells = getattr(game, '_cells', None)
+
+        if cells is not None:
+            board = bytearray(''.join(cells), 'ascii')
+        else:
+            board = bytearray([BORDER]) * ((columns + 2) * (rows + 2))
+            for column_index, column in enumerate(game.state):
+                for row_index, tile in enumerate(column):
+                    board[(row_index + 1) * (columns + 2) + column_index + 1] = ord(tile)
+
+        flags = 0
+        if game.player_turn == -1:
+            flags |= BLACK_TO_MOVE_FLAG
+        if game.win_condition == 'LEAST':
+            flags |= WIN_TYPE_LEAST_FLAG
+        if game.center_tile[0] == othello.BLACK:
+            flags |= CENTER_TILE_BLACK_FLAG
+
+        return cls(columns, rows, board, flags)
+
+    def to_game(self) -> othello.OthelloGame:
+        '''Returns an othello.OthelloGame with this position.'''
+
+        game = othello.OthelloGame(self.columns, self.rows, 'WHITE',
+                                   self.win_condition, self.center_tile)
+        board = self._board
+
+        for move, (index, rays) in _return_square_table(self.columns,
+                                                        self.rows).items():
+            if board[index] != NONE:
+                game._place_tile(move, chr(board[index]))
+        game.player_turn = self.player_turn
+
+        return game
+
+    def clone(self) -> 'Position':
+        '''Returns a copy of the position, made with one copy of the
+        board.'''
+
+        return Position(self.columns, self.rows, bytearray(self._board),
+                        self._flags)
+
+    def __copy__(self) -> 'Position':
+        return self.clone()
+
+    def __deepcopy__(self, memo: dict) -> 'Position':
+        return self.clone()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Position):
+            return NotImplemented
+        return (self._flags == other._flags and self.columns == other.columns
+                and self._board == other._board)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash((bytes(self._board), self._flags, self.columns))
+        return self._hash
+
+    @property
+    def player_turn(self) -> int:
+        '''1 if it is WHITE's turn and -1 if it is BLACK's, as in
+        othello.OthelloGame.'''
+
+        if self._flags & BLACK_TO_MOVE_FLAG:
+            return -1
+        return 1
+
+    @property
+    def win_condition(self) -> str:
+        '''The win type, 'MOST' or 'LEAST'.'''
+
+        if self._flags & WIN_TYPE_LEAST_FLAG:
+            return 'LEAST'
+        return 'MOST'
+
+    @property
+    def center_tile(self) -> str:
+        '''The color of the top left center tile, 'WHITE' or 'BLACK'.'''
+
+        if self._flags & CENTER_TILE_BLACK_FLAG:
+            return 'BLACK'
+        return 'WHITE'
+
+    def get_turn(self) -> str:
+        '''Returns whose turn it is.'''
+
+        if self._flags & BLACK_TO_MOVE_FLAG:
+            return othello.BLACK
+        return othello.WHITE
+
+    def get_tile(self, column: int, row: int) -> str:
+        '''Returns the tile at a (column, row) position. Raises an
+        othello.OutsideBoardError if it is not on the board.'''
+
+        if not (1 <= column <= self.columns and 1 <= row <= self.rows):
+            raise othello.OutsideBoardError()
+        return chr(self._board[row * (self.columns + 2) + column])
+
+    def get_score(self) -> tuple:
+        '''Returns the score in a tuple. (WHITE, BLACK).'''
+
+        return (self._board.count(WHITE), self._board.count(BLACK))
+
+    def get_empty_count(self) -> int:
+        '''Returns the number of empty tiles on the board.'''
+
+        return self._board.count(NONE)
+
+    def get_possible_moves(self) -> list:
+        '''Returns a list of the (column, row) positions the current
+        player can move to.'''
+
+        board = self._board
+        player, opponent = self._return_players()
+        moves = []
+
+        for move, (index, rays) in _return_square_table(self.columns,
+                                                        self.rows).items():
+            if board[index] != NONE:
+                continue
+            for indexes in rays:
+                if board[indexes[0]] != opponent:
+                    continue
+                for ray_index in indexes:
+                    if board[ray_index] != opponent:
+                        break
+                if board[ray_index] == player:
+                    moves.append(move)
+                    break
+
+        return moves
+
+    def play(self, move: tuple) -> 'Position':
+        '''Returns the position after the current player moves to a
+        (column, row) position. Raises an othello.InvalidMoveError if the
+        move is not allowed.'''
+
+        square = _return_square_table(self.columns, self.rows).get(move)
+        if square is None or self._board[square[0]] != NONE:
+            raise othello.InvalidMoveError()
+
+        index, rays = square
+        board = self._board
+        player, opponent = self._return_players()
+        flips = []
+
+        for indexes in rays:
+            count = 0
+            while board[indexes[count]] == opponent:
+                count += 1
+            if count > 0 and board[indexes[count]] == player:
+                flips.extend(indexes[:count])
+
+        if len(flips) == 0:
+            raise othello.InvalidMoveError()
+
+        new_board = bytearray(board)
+        new_board[index] = player
+        for flip_index in flips:
+            new_board[flip_index] = player
+
+        return Position(self.columns, self.rows, new_board,
+                        self._flags ^ BLACK_TO_MOVE_FLAG)
+
+    def pass_turn(self) -> 'Position':
+        '''Returns the same position with the other player to move.'''
+
+        return Position(self.columns, self.rows, self._board,
+                        self._flags ^ BLACK_TO_MOVE_FLAG)
+
+    def check_if_game_over(self) -> bool:
+        '''Returns True if neither player can move. Unlike
+        OthelloGame.check_if_game_over the position is not changed.'''
+
+        return (len(self.get_possible_moves()) == 0
+                and len(self.pass_turn().get_possible_moves()) == 0)
+
+    def _return_players(self) -> tuple:
+        '''Returns the tile bytes of the current player and their
+        opponent.'''
+
+        if self._flags & BLACK_TO_MOVE_FLAG:
+            return (BLACK, WHITE)
+        return (WHITE, BLACK)
+
+
+#FUNCTIONS USED BY THE POSITION CLASS:
+
+_square_tables = {}
+
+def _return_square_table(columns: int, rows: int) -> dict:
+    '''Returns a dictionary mapping each (column, row) position, in
+    column then row order, to its index in the padded board and a tuple
+    of the padded indexes along each ray leaving it, ending on the BORDER
+    tile past the edge, taken from othello's shared ray table.'''
+
+    square_table = _square_tables.get((columns, rows))
+
+    if square_table is None:
+        square_table = {}
+        for move, rays in othello._return_ray_table(columns, rows).items():
+            square_table[move] = (move[1] * (columns + 2) + move[0],
+                                  tuple(ray[1] for ray in rays.values()))
+        _square_tables[(columns, rows)] = square_table
+
+    return square_table
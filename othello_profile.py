@@ -0,0 +1,259 @@
+import argparse
+import cProfile
+import functools
+import io
+import json
+import pstats
+import sys
+import time
+import othello
+import othello_simulate
+
+# The OthelloGame methods counted and timed while instrumentation is on.
+# Every move, including those made and unmade by the search players, goes
+# through make_move, and every move generation through _return_move_table.
+INSTRUMENTED_METHODS = ['_return_move_table', '_check_direction',
+                        '_flip_tiles', 'get_score', 'make_move',
+                        'execute_move']
+
+class InstrumentationError(Exception):
+    pass
+
+class Instrumentation:
+    '''Counts the calls of the INSTRUMENTED_METHODS of othello.OthelloGame
+    and adds up the time spent in them, along with the moves made and the
+    positions whose moves were generated and their number of possible
+    moves. The methods are only wrapped between enable and disable, so
+    the engine runs unchanged, at no cost, the rest of the time. Times
+    include the methods called from inside, so execute_move includes
+    _flip_tiles. Only the list engine is instrumented;
+    othello_bitboard.BitboardOthelloGame is not.'''
+
+    def __init__(self):
+        '''Creates a disabled Instrumentation with empty counters.'''
+
+        self._originals = {}
+        self.reset()
+
+    def reset(self) -> None:
+        '''Clears the counters.'''
+
+        self.calls = {name: 0 for name in INSTRUMENTED_METHODS}
+        self.seconds = {name: 0.0 for name in INSTRUMENTED_METHODS}
+        self.moves = 0
+        self.positions = 0
+        self.possible_moves = 0
+        self.elapsed = 0.0
+        self._start = None
+        if self.is_enabled():
+            self._start = time.perf_counter()
+
+    def is_enabled(self) -> bool:
+        '''Returns True if the methods are wrapped.'''
+
+        return len(self._originals) > 0
+
+    def enable(self) -> None:
+        '''Wraps the methods of OthelloGame. Raises an InstrumentationError
+        if another Instrumentation is enabled.'''
+
+        global _enabled
+
+        if _enabled is not None:
+            raise InstrumentationError('instrumentation is already enabled')
+        _enabled = self
+
+        for name in INSTRUMENTED_METHODS:
+            method = getattr(othello.OthelloGame, name)
+            self._originals[name] = method
+            setattr(othello.OthelloGame, name, self._wrap(name, method))
+        self._start = time.perf_counter()
+
+    def disable(self) -> None:
+        '''Puts the original methods of OthelloGame back. The counters are
+        kept until reset.'''
+
+        global _enabled
+
+        if not self.is_enabled():
+            return
+
+        self.elapsed += time.perf_counter() - self._start
+        self._start = None
+        for name, method in self._originals.items():
+            setattr(othello.OthelloGame, name, method)
+        self._originals = {}
+        _enabled = None
+
+    def __enter__(self) -> 'Instrumentation':
+        self.enable()
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.disable()
+
+    def snapshot(self) -> dict:
+        '''Returns the counters as a dictionary which json can write: the
+        seconds enabled, the moves made, moves per second, the positions
+        whose moves were generated, their average number of possible moves
+        (the branching factor) and the calls and seconds of each method.'''
+
+        elapsed = self.elapsed
+        if self._start is not None:
+            elapsed += time.perf_counter() - self._start
+
+        methods = {}
+        for name in INSTRUMENTED_METHODS:
+            calls = self.calls[name]
+            methods[name] = {'calls': calls, 'seconds': self.seconds[name],
+                'us_per_call': self.seconds[name] / max(calls, 1) * 1000000}
+
+        return {'seconds': elapsed, 'moves': self.moves,
+                'moves_per_second': self.moves / max(elapsed, 1e-9),
+                'positions': self.positions,
+                'branching_factor': self.possible_moves / max(self.positions, 1),
+                'methods': methods}
+
+    def to_json(self) -> str:
+        '''Returns the snapshot as a JSON string.'''
+
+        return json.dumps(self.snapshot(), indent = 2)
+
+    def _wrap(self, name: str, method: 'function') -> 'function':
+        '''Returns a function which calls method and adds its call and
+        time to the counters of name.'''
+
+        calls = self.calls
+        seconds = self.seconds
+        perf_counter = time.perf_counter
+
+        if name == '_return_move_table':
+            @functools.wraps(method)
+            def wrapper(game, *arguments):
+                generated = game.player_turn not in game._move_cache
+                start = perf_counter()
+                try:
+                    move_table = method(game, *arguments)
+                finally:
+                    seconds[name] += perf_counter() - start
+                    calls[name] += 1
+                if generated:
+                    self.positions += 1
+                    self.possible_moves += len(move_table)
+                return move_table
+        elif name == 'make_move':
+            @functools.wraps(method)
+            def wrapper(game, *arguments):
+                start = perf_counter()
+                try:
+                    record = method(game, *arguments)
+                finally:
+                    seconds[name] += perf_counter() - start
+                    calls[name] += 1
+                self.moves += 1
+                return record
+        else:
+            @functools.wraps(method)
+            def wrapper(game, *arguments):
+                start = perf_counter()
+                try:
+                    return method(game, *arguments)
+                finally:
+                    seconds[name] += perf_counter() - start
+                    calls[name] += 1
+
+        return wrapper
+
+def play_games(config: dict, games: int) -> list:
+    '''Plays games games in this process with the settings of an
+    othello_simulate config and returns their results.'''
+
+    return [othello_simulate.play_game(config, game_index)
+            for game_index in range(games)]
+
+def profile_games(config: dict, games: int, sort: str = 'cumulative',
+                  limit: int = 25) -> str:
+    '''Plays games games under cProfile and returns the statistics of
+    the limit most expensive functions, sorted by sort.'''
+
+    profiler = cProfile.Profile()
+    profiler.runcall(play_games, config, games)
+
+    output = io.StringIO()
+    statistics = pstats.Stats(profiler, stream = output)
+    statistics.strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+def main(arguments: list = None) -> None:
+    '''Plays a batch of games with the engine instrumented, then prints
+    the counters, or writes them as JSON, and optionally the cProfile
+    statistics of a second batch.'''
+
+    parser = argparse.ArgumentParser(
+        description = 'Measures where the Othello engine spends its time. '
+                      'Games are played on the list engine, othello.OthelloGame; '
+                      'the bitboard engine is not instrumented.')
+    parser.add_argument('--games', type = int, default = 20)
+    parser.add_argument('--columns', type = int, default = 8)
+    parser.add_argument('--rows', type = int, default = 8)
+    parser.add_argument('--win-type', default = 'MOST',
+                        choices = ['MOST', 'LEAST'])
+    parser.add_argument('--white', default = 'random',
+                        choices = sorted(othello_simulate.PLAYERS))
+    parser.add_argument('--black', default = 'random',
+                        choices = sorted(othello_simulate.PLAYERS))
+    parser.add_argument('--time-limit', type = float, default = 0.1,
+                        help = 'seconds per move for the search and mcts players')
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--json', default = None,
+                        help = "write the counters to this file, or '-' for standard output")
+    parser.add_argument('--cprofile', action = 'store_true',
+                        help = 'also play the games under cProfile')
+    parser.add_argument('--sort', default = 'cumulative',
+                        help = 'pstats sort key for --cprofile')
+    parser.add_argument('--limit', type = int, default = 25,
+                        help = 'functions shown by --cprofile')
+    args = parser.parse_args(arguments)
+
+    othello._verify_board_size(args.columns, args.rows)
+
+    config = {'columns': args.columns, 'rows': args.rows,
+              'first_player': 'BLACK', 'win_type': args.win_type,
+              'center_tile': 'WHITE', 'white': args.white,
+              'black': args.black, 'time_limit': args.time_limit,
+              'seed': args.seed, 'engine': 'list'}
+
+    with Instrumentation() as instrumentation:
+        play_games(config, args.games)
+
+    if args.json == '-':
+        print(instrumentation.to_json())
+    else:
+        if args.json is not None:
+            with open(args.json, 'w') as json_file:
+                json_file.write(instrumentation.to_json())
+        _print_snapshot(instrumentation.snapshot())
+
+    if args.cprofile:
+        print(profile_games(config, args.games, args.sort, args.limit),
+              file = sys.stderr if args.json == '-' else sys.stdout)
+
+
+#FUNCTIONS USED BY THE INSTRUMENTATION:
+
+# The Instrumentation whose wrappers are installed, if any.
+_enabled = None
+
+def _print_snapshot(snapshot: dict) -> None:
+    '''Prints the counters of a snapshot as a table.'''
+
+    print('{} moves in {:.2f}s ({:.1f} moves/sec), {} positions generated, branching factor {:.2f}'.format(
+        snapshot['moves'], snapshot['seconds'], snapshot['moves_per_second'],
+        snapshot['positions'], snapshot['branching_factor']))
+    for name, method in snapshot['methods'].items():
+        print('  {:24} {:10} calls {:9.3f}s {:9.2f} us/call'.format(
+            name, method['calls'], method['seconds'], method['us_per_call']))
+
+if __name__ == '__main__':
+
+    main()
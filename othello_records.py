@@ -0,0 +1,232 @@
+import array
+import mmap
+import struct
+import othello
+
+# A record file starts with FILE_HEADER. Each game follows as a GAME_HEADER
+# (columns, rows, flags, number of moves) and then one byte per move. A
+# move byte is (row - 1) * columns + (column - 1). A pass is written as the
+# byte of the top left center square, which begin_game always fills, so
+# it can never be a real move.
+FILE_HEADER = b'OTHR\x01'
+GAME_HEADER = struct.Struct('<BBBH')
+
+FIRST_PLAYER_BLACK_FLAG = 1
+WIN_TYPE_LEAST_FLAG = 2
+CENTER_TILE_BLACK_FLAG = 4
+ALL_FLAGS = FIRST_PLAYER_BLACK_FLAG | WIN_TYPE_LEAST_FLAG | CENTER_TILE_BLACK_FLAG
+
+class RecordError(Exception):
+    pass
+
+class GameRecord:
+    '''The settings and move list of one recorded game. A pass is stored
+    as None in the move list.'''
+
+    def __init__(self, columns: int, rows: int, first_player: str,
+                 win_type: str, center_tile: str, moves: list):
+        '''Creates a GameRecord from the same settings as an
+        othello.OthelloGame and a list of (column, row) moves.'''
+
+        self.columns = columns
+        self.rows = rows
+        self.first_player = first_player
+        self.win_type = win_type
+        self.center_tile = center_tile
+        self.moves = moves
+
+    def create_game(self) -> othello.OthelloGame:
+        '''Returns a new OthelloGame in its begin_game position with the
+        settings of this record.'''
+
+        game = othello.OthelloGame(self.columns, self.rows, self.first_player,
+                                   self.win_type, self.center_tile)
+        game.begin_game()
+        return game
+
+class RecordWriter:
+    '''Writes GameRecords one at a time to a binary file object.'''
+
+    def __init__(self, file: 'binary file'):
+        '''Creates a RecordWriter and writes the file header.'''
+
+        self.file = file
+        self.file.write(FILE_HEADER)
+
+    def write_game(self, record: GameRecord) -> None:
+        '''Writes one game record to the file.'''
+
+        if len(record.moves) > 0xFFFF:
+            raise RecordError()
+
+        othello._verify_board_size(record.columns, record.rows)
+        pass_code = _return_pass_code(record.columns, record.rows)
+        flags = 0
+        if record.first_player == 'BLACK':
+            flags |= FIRST_PLAYER_BLACK_FLAG
+        if record.win_type == 'LEAST':
+            flags |= WIN_TYPE_LEAST_FLAG
+        if record.center_tile == 'BLACK':
+            flags |= CENTER_TILE_BLACK_FLAG
+
+        move_bytes = bytearray()
+        for move in record.moves:
+            if move is None:
+                move_bytes.append(pass_code)
+            else:
+                move_bytes.append((move[1] - 1) * record.columns + move[0] - 1)
+
+        self.file.write(GAME_HEADER.pack(record.columns, record.rows, flags,
+                                         len(record.moves)))
+        self.file.write(move_bytes)
+
+class RecordFile:
+    '''Random access to the games in a record file through mmap. The
+    offset of each game is found once when the file is opened, by
+    reading only the game headers.'''
+
+    def __init__(self, path: str):
+        '''Opens and maps the record file at path.'''
+
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access = mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise RecordError()
+
+        if self._map[:len(FILE_HEADER)] != FILE_HEADER:
+            self.close()
+            raise RecordError()
+
+        self._offsets = array.array('Q')
+        offset = len(FILE_HEADER)
+        while offset < len(self._map):
+            if offset + GAME_HEADER.size > len(self._map):
+                self.close()
+                raise RecordError()
+            header = GAME_HEADER.unpack_from(self._map, offset)
+            if not _check_header(header):
+                self.close()
+                raise RecordError()
+            self._offsets.append(offset)
+            offset += GAME_HEADER.size + header[3]
+            if offset > len(self._map):
+                self.close()
+                raise RecordError()
+
+    def __len__(self) -> int:
+        '''Returns the number of games in the file.'''
+
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> GameRecord:
+        '''Returns the game record at index.'''
+
+        offset = self._offsets[index]
+        header = GAME_HEADER.unpack_from(self._map, offset)
+        start = offset + GAME_HEADER.size
+        return _decode_game(header, self._map[start:start + header[3]])
+
+    def __enter__(self) -> 'RecordFile':
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        '''Unmaps and closes the file.'''
+
+        self._map.close()
+        self._file.close()
+
+def read_records(file: 'binary file') -> 'GameRecords':
+    '''Yields the GameRecords in a binary file object one at a time,
+    without reading the whole file into memory.'''
+
+    if file.read(len(FILE_HEADER)) != FILE_HEADER:
+        raise RecordError()
+
+    while True:
+        header_bytes = file.read(GAME_HEADER.size)
+        if len(header_bytes) == 0:
+            return
+        if len(header_bytes) != GAME_HEADER.size:
+            raise RecordError()
+
+        header = GAME_HEADER.unpack(header_bytes)
+        if not _check_header(header):
+            raise RecordError()
+        move_bytes = file.read(header[3])
+        if len(move_bytes) != header[3]:
+            raise RecordError()
+
+        yield _decode_game(header, move_bytes)
+
+def replay_record(record: GameRecord) -> othello.OthelloGame:
+    '''Plays the moves of a record through an OthelloGame and returns the
+    game. Raises an othello.InvalidMoveError if a move or pass in the
+    record is not allowed.'''
+
+    game = record.create_game()
+
+    for move in record.moves:
+        if move is None:
+            if game.check_if_player_can_move():
+                raise othello.InvalidMoveError()
+        else:
+            game.execute_move(move)
+
+    return game
+
+
+#FUNCTIONS USED BY THE RECORD READERS AND WRITER:
+
+def _return_pass_code(columns: int, rows: int) -> int:
+    '''Returns the move byte used for a pass on a board of this size.'''
+
+    return (int(rows/2) - 1) * columns + int(columns/2) - 1
+
+def _check_header(header: tuple) -> bool:
+    '''Returns True if an unpacked game header has a board size
+    othello accepts and only known flags.'''
+
+    columns, rows, flags, move_count = header
+
+    try:
+        othello._verify_board_size(columns, rows)
+    except othello.BoardSizeError:
+        return False
+
+    return flags & ~ALL_FLAGS == 0
+
+def _decode_game(header: tuple, move_bytes: bytes) -> GameRecord:
+    '''Returns the GameRecord for an unpacked game header and its moves.'''
+
+    columns, rows, flags, move_count = header
+    pass_code = _return_pass_code(columns, rows)
+    moves = []
+
+    for code in move_bytes:
+        if code >= columns * rows:
+            raise RecordError()
+        if code == pass_code:
+            moves.append(None)
+        else:
+            moves.append((code % columns + 1, code // columns + 1))
+
+    if flags & FIRST_PLAYER_BLACK_FLAG:
+        first_player = 'BLACK'
+    else:
+        first_player = 'WHITE'
+    if flags & WIN_TYPE_LEAST_FLAG:
+        win_type = 'LEAST'
+    else:
+        win_type = 'MOST'
+    if flags & CENTER_TILE_BLACK_FLAG:
+        center_tile = 'BLACK'
+    else:
+        center_tile = 'WHITE'
+
+    return GameRecord(columns, rows, first_player, win_type, center_tile, moves)
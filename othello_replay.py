@@ -0,0 +1,270 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import othello
+import othello_records
+
+# Results waiting to be written that the pool processes may queue up
+# before they block, which bounds the memory used however large the
+# archives are.
+QUEUE_SIZE = 256
+
+# Settings of text games that do not give their own.
+DEFAULT_SETTINGS = {'columns': 8, 'rows': 8, 'first_player': 'BLACK',
+                    'win_type': 'MOST', 'center_tile': 'WHITE'}
+
+# Errors which stop one game from being replayed without affecting the
+# rest of its file.
+GAME_ERRORS = (othello.BoardSizeError, othello.OutsideBoardError,
+               othello.InvalidPlayerError, othello.InvalidMoveError,
+               othello.InvalidWinTypeError, othello.InvalidTileError,
+               ValueError, TypeError)
+
+class ReplayError(Exception):
+    pass
+
+def read_games(file: 'binary file', settings: dict = None) -> 'GameRecords':
+    '''Yields the GameRecords in a binary file object one at a time. The
+    file is either an othello_records file or text with one game per
+    line. A text game is either a JSON object with a list of moves, like
+    the lines othello_simulate prints, or moves separated by spaces,
+    each written as column,row, as a square like d3 or as pass. Blank
+    lines and lines starting with # are skipped. Settings missing from a
+    text game are taken from settings, then DEFAULT_SETTINGS. A line
+    which cannot be read is yielded as a ReplayError in place of its
+    game, and reading goes on with the next line.'''
+
+    if file.peek(len(othello_records.FILE_HEADER)).startswith(
+            othello_records.FILE_HEADER):
+        yield from othello_records.read_records(file)
+        return
+
+    game_settings = dict(DEFAULT_SETTINGS)
+    if settings is not None:
+        game_settings.update(settings)
+
+    for line_number, line in enumerate(file, 1):
+        try:
+            line = line.decode('utf-8').strip()
+        except UnicodeDecodeError:
+            yield ReplayError('line {}: not UTF-8'.format(line_number))
+            continue
+        if len(line) == 0 or line.startswith('#'):
+            continue
+        try:
+            record = _parse_game(line, game_settings)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            record = ReplayError('line {}: {}'.format(line_number,
+                str(error) or type(error).__name__))
+        yield record
+
+def replay_game(record: othello_records.GameRecord) -> dict:
+    '''Plays the moves of a record through OthelloGame.execute_move and
+    returns its statistics: the number of moves, the final score, the
+    winner under the record's win type and under 'MOST' and 'LEAST', the
+    number of passes, whether the game was played to the end and the
+    mobility, the number of possible moves, before each ply. Passes the
+    record leaves out are counted too. Raises an othello.InvalidMoveError
+    if a move or pass is not allowed.'''
+
+    game = record.create_game()
+    passes = 0
+    mobility = []
+
+    for move in record.moves:
+        if move is not None and not game.check_if_player_can_move():
+            passes += 1
+            mobility.append(0)
+        mobility.append(len(game.get_possible_moves()))
+        if move is None:
+            if game.check_if_player_can_move():
+                raise othello.InvalidMoveError()
+            passes += 1
+        else:
+            game.execute_move(move)
+
+    score = game.get_score()
+    winners = {'MOST': othello._return_highest_count(*score),
+               'LEAST': othello._return_lowest_count(*score)}
+
+    return {'columns': record.columns, 'rows': record.rows,
+            'win_type': record.win_type, 'moves': len(record.moves),
+            'score': score, 'winner': winners[record.win_type],
+            'winner_most': winners['MOST'], 'winner_least': winners['LEAST'],
+            'passes': passes, 'finished': game.check_if_game_over(),
+            'mobility': mobility}
+
+def replay_games(records: 'GameRecords', name: str = '-') -> 'results':
+    '''Replays each record from an iterable as it arrives and yields its
+    statistics with the file name and game index, or the error if the
+    game could not be read or replayed.'''
+
+    for index, record in enumerate(records):
+        result = {'file': name, 'game': index}
+        if isinstance(record, ReplayError):
+            result['error'] = str(record)
+        else:
+            try:
+                result.update(replay_game(record))
+            except GAME_ERRORS as error:
+                result['error'] = str(error) or type(error).__name__
+        yield result
+
+def replay_file(path: str, settings: dict = None) -> 'results':
+    '''Yields the statistics of every game in the file at path, or in
+    standard input if path is '-'. An unreadable file yields one result
+    with its error.'''
+
+    try:
+        if path == '-':
+            yield from replay_games(read_games(sys.stdin.buffer, settings), path)
+        else:
+            with open(path, 'rb') as file:
+                yield from replay_games(read_games(file, settings), path)
+    except (OSError, othello_records.RecordError) as error:
+        yield {'file': path, 'error': str(error) or type(error).__name__}
+
+def replay_files(paths: list, settings: dict = None,
+                 processes: int = None) -> 'results':
+    '''Yields the statistics of every game in the files at paths. Files
+    are replayed concurrently on a process pool, one file per process at
+    a time, and results are yielded in the order they finish; within a
+    file they keep their order. Uses one process per core unless
+    processes is given; with one process, or for standard input, no pool
+    is started.'''
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes == 1 or len(paths) < 2 or '-' in paths:
+        for path in paths:
+            yield from replay_file(path, settings)
+        return
+
+    queue = multiprocessing.Queue(QUEUE_SIZE)
+    with multiprocessing.Pool(min(processes, len(paths)), _start_worker,
+                              (queue,)) as pool:
+        jobs = pool.map_async(_replay_file_job,
+                              [(path, settings) for path in paths])
+        finished = 0
+        while finished < len(paths):
+            result = queue.get()
+            if result is None:
+                finished += 1
+            else:
+                yield result
+        jobs.get()
+
+def main(arguments: list = None) -> None:
+    '''Runs the replay tool from the command line, printing one JSON line
+    per game followed by totals on standard error.'''
+
+    parser = argparse.ArgumentParser(
+        description = 'Replays recorded Othello games and prints statistics.')
+    parser.add_argument('paths', nargs = '*', default = ['-'],
+                        help = "record or text files, or '-' for standard input")
+    parser.add_argument('--columns', type = int, default = 8,
+                        help = 'board size of text games')
+    parser.add_argument('--rows', type = int, default = 8,
+                        help = 'board size of text games')
+    parser.add_argument('--first-player', default = 'BLACK',
+                        choices = ['BLACK', 'WHITE'])
+    parser.add_argument('--win-type', default = 'MOST',
+                        choices = ['MOST', 'LEAST'])
+    parser.add_argument('--center-tile', default = 'WHITE',
+                        choices = ['WHITE', 'BLACK'])
+    parser.add_argument('--processes', type = int, default = None)
+    parser.add_argument('--no-mobility', action = 'store_true',
+                        help = 'leave the mobility lists out of the output')
+    args = parser.parse_args(arguments)
+
+    othello._verify_board_size(args.columns, args.rows)
+
+    settings = {'columns': args.columns, 'rows': args.rows,
+                'first_player': args.first_player, 'win_type': args.win_type,
+                'center_tile': args.center_tile}
+
+    totals = {'games': 0, 'errors': 0, 'WHITE': 0, 'BLACK': 0, 'TIE': 0}
+    start = time.perf_counter()
+
+    for result in replay_files(args.paths, settings, args.processes):
+        if 'error' in result:
+            totals['errors'] += 1
+        else:
+            totals['games'] += 1
+            totals[result['winner']] += 1
+            if args.no_mobility:
+                del result['mobility']
+        print(json.dumps(result), flush = True)
+
+    elapsed = time.perf_counter() - start
+    print('{} games in {:.2f}s ({:.1f} games/sec): white {} black {} tie {}, {} errors'.format(
+        totals['games'], elapsed, totals['games'] / max(elapsed, 1e-9),
+        totals['WHITE'], totals['BLACK'], totals['TIE'], totals['errors']),
+        file = sys.stderr)
+
+
+#FUNCTIONS USED BY THE REPLAY TOOL:
+
+# The queue a pool process puts its results on.
+_worker_queue = None
+
+def _start_worker(queue: 'multiprocessing.Queue') -> None:
+    '''Keeps the result queue in a new pool process.'''
+
+    global _worker_queue
+    _worker_queue = queue
+
+def _replay_file_job(job: tuple) -> None:
+    '''Replays a (path, settings) job in a pool process, putting each
+    result on the queue as it is made and None when the file is done.'''
+
+    try:
+        for result in replay_file(*job):
+            _worker_queue.put(result)
+    finally:
+        _worker_queue.put(None)
+
+def _parse_game(line: str, settings: dict) -> othello_records.GameRecord:
+    '''Returns the GameRecord for one line of a text file.'''
+
+    if line.startswith('{'):
+        game = json.loads(line)
+        settings = dict(settings)
+        for key in settings:
+            if key in game:
+                settings[key] = game[key]
+        moves = [_parse_move(move) for move in game['moves']]
+    else:
+        moves = [_parse_move(token) for token in line.split()]
+
+    return othello_records.GameRecord(settings['columns'], settings['rows'],
+        settings['first_player'], settings['win_type'],
+        settings['center_tile'], moves)
+
+def _parse_move(move: 'move') -> tuple:
+    '''Returns the (column, row) move, or None for a pass, written as a
+    JSON list or null, or a text token.'''
+
+    if move is None:
+        return None
+    if isinstance(move, list):
+        column, row = move
+        return (int(column), int(row))
+
+    token = move.lower()
+    if token in ('pass', 'none', '--'):
+        return None
+    if ',' in token:
+        column, row = token.split(',')
+        return (int(column), int(row))
+    if token[0].isalpha():
+        return (ord(token[0]) - ord('a') + 1, int(token[1:]))
+    raise ValueError('unreadable move {!r}'.format(move))
+
+if __name__ == '__main__':
+
+    main()
@@ -0,0 +1,153 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import othello
+import othello_ai
+import othello_book
+import othello_engine
+import othello_mcts
+import othello_records
+
+PLAYERS = {
+    'random': lambda seed, time_limit, book: othello_ai.RandomPlayer(seed),
+    'greedy': lambda seed, time_limit, book: othello_ai.GreedyPlayer(seed),
+    'search': lambda seed, time_limit, book: othello_ai.AlphaBetaPlayer(
+        time_limit, opening_book = book),
+    'mcts': lambda seed, time_limit, book: othello_mcts.MCTSPlayer(
+        time_limit, seed = seed)}
+
+# Opening books opened by this process, keyed by path. Every game played
+# in the process shares them, and every process maps the same pages.
+_books = {}
+
+def play_game(config: dict, game_index: int) -> dict:
+    '''Plays one game with the settings in config and returns its result:
+    the game index, winner, final score and list of moves, where a pass
+    is recorded as None.'''
+
+    seed = config['seed'] + game_index
+    book = _return_book(config.get('book'))
+    players = {
+        1: PLAYERS[config['white']](seed, config['time_limit'], book),
+        -1: PLAYERS[config['black']](seed + 1, config['time_limit'], book)}
+
+    game = othello_engine.create_game(config['columns'], config['rows'],
+        config['first_player'], config['win_type'], config['center_tile'],
+        config.get('engine', 'list'))
+    game.begin_game()
+    moves = []
+
+    while True:
+        if not game.check_if_player_can_move():
+            if not game.check_if_player_can_move():
+                break
+            moves.append(None)
+        move = players[game.player_turn].choose_move(game)
+        game.execute_move(move)
+        moves.append(move)
+
+    return {'game': game_index, 'winner': game.return_winner(),
+            'score': game.get_score(), 'moves': moves}
+
+def simulate(config: dict, games: int, processes: int = None) -> 'results':
+    '''Plays games games on a process pool and yields each result as soon
+    as it is finished, in no particular order. Uses one process per core
+    unless processes is given; with one process no pool is started.'''
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes == 1:
+        for game_index in range(games):
+            yield play_game(config, game_index)
+        return
+
+    with multiprocessing.Pool(processes) as pool:
+        jobs = [(config, game_index) for game_index in range(games)]
+        for result in pool.imap_unordered(_play_game_job, jobs):
+            yield result
+
+def main(arguments: list = None) -> None:
+    '''Runs the simulator from the command line, printing one JSON line
+    per game followed by totals on standard error.'''
+
+    parser = argparse.ArgumentParser(
+        description = 'Plays Othello games between computer players.')
+    parser.add_argument('--games', type = int, default = 100)
+    parser.add_argument('--columns', type = int, default = 8)
+    parser.add_argument('--rows', type = int, default = 8)
+    parser.add_argument('--first-player', default = 'BLACK',
+                        choices = ['BLACK', 'WHITE'])
+    parser.add_argument('--win-type', default = 'MOST',
+                        choices = ['MOST', 'LEAST'])
+    parser.add_argument('--center-tile', default = 'WHITE',
+                        choices = ['WHITE', 'BLACK'])
+    parser.add_argument('--white', default = 'random', choices = sorted(PLAYERS))
+    parser.add_argument('--black', default = 'random', choices = sorted(PLAYERS))
+    parser.add_argument('--time-limit', type = float, default = 0.1,
+                        help = 'seconds per move for the search and mcts players')
+    parser.add_argument('--processes', type = int, default = None)
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--record', default = None,
+                        help = 'also write the games to this binary record file')
+    parser.add_argument('--book', default = None,
+                        help = 'opening book used by the search player')
+    parser.add_argument('--engine', default = 'list',
+                        choices = sorted(othello_engine.ENGINES))
+    args = parser.parse_args(arguments)
+
+    othello._verify_board_size(args.columns, args.rows)
+
+    config = {'columns': args.columns, 'rows': args.rows,
+              'first_player': args.first_player, 'win_type': args.win_type,
+              'center_tile': args.center_tile, 'white': args.white,
+              'black': args.black, 'time_limit': args.time_limit,
+              'seed': args.seed, 'book': args.book, 'engine': args.engine}
+
+    wins = {'WHITE': 0, 'BLACK': 0, 'TIE': 0}
+    start = time.perf_counter()
+
+    if args.record is not None:
+        record_file = open(args.record, 'wb')
+        writer = othello_records.RecordWriter(record_file)
+
+    for result in simulate(config, args.games, args.processes):
+        wins[result['winner']] += 1
+        print(json.dumps(result), flush = True)
+        if args.record is not None:
+            writer.write_game(othello_records.GameRecord(args.columns,
+                args.rows, args.first_player, args.win_type,
+                args.center_tile, result['moves']))
+
+    if args.record is not None:
+        record_file.close()
+
+    elapsed = time.perf_counter() - start
+    print('{} games in {:.2f}s ({:.1f} games/sec): white {} black {} tie {}'.format(
+        args.games, elapsed, args.games / elapsed, wins['WHITE'],
+        wins['BLACK'], wins['TIE']), file = sys.stderr)
+
+
+#FUNCTIONS USED BY THE SIMULATOR:
+
+def _play_game_job(job: tuple) -> dict:
+    '''Unpacks a (config, game index) job for a pool worker.'''
+
+    return play_game(job[0], job[1])
+
+def _return_book(path: str) -> 'OpeningBook':
+    '''Returns the opening book at path, opening it the first time it is
+    used in this process, or None if path is None.'''
+
+    if path is None:
+        return None
+    if path not in _books:
+        _books[path] = othello_book.OpeningBook(path)
+    return _books[path]
+
+if __name__ == '__main__':
+
+    main()
@@ -0,0 +1,202 @@
+import operator
+import random
+import sys
+import othello
+
+# The symmetries of a board, in the order get_transforms returns them.
+# Rectangular boards only have the first 4; square boards have all 8.
+SYMMETRIES = ['identity', 'flip_columns', 'flip_rows', 'rotate_180',
+              'transpose', 'rotate_90', 'rotate_270', 'anti_transpose']
+
+class SymmetryError(Exception):
+    pass
+
+class Transform:
+    '''One symmetry of a board size. Squares are zero based indexes,
+    (row - 1) * columns + (column - 1), and a packed board is a string
+    with the tile of each square in that order. forward maps a square to
+    the square it moves to and backward maps it back.'''
+
+    def __init__(self, name: str, columns: int, rows: int):
+        '''Builds the square tables for the symmetry called name on a
+        board with columns columns and rows rows.'''
+
+        last_column = columns - 1
+        last_row = rows - 1
+        functions = {
+            'identity': lambda column, row: (column, row),
+            'flip_columns': lambda column, row: (last_column - column, row),
+            'flip_rows': lambda column, row: (column, last_row - row),
+            'rotate_180': lambda column, row: (last_column - column, last_row - row),
+            'transpose': lambda column, row: (row, column),
+            'rotate_90': lambda column, row: (last_row - row, column),
+            'rotate_270': lambda column, row: (row, last_column - column),
+            'anti_transpose': lambda column, row: (last_row - row, last_column - column)}
+
+        self.name = name
+        self.columns = columns
+        self.rows = rows
+        self.forward = [0] * (columns * rows)
+        self.backward = [0] * (columns * rows)
+
+        for square in range(columns * rows):
+            column, row = functions[name](square % columns, square // columns)
+            self.forward[square] = row * columns + column
+            self.backward[row * columns + column] = square
+
+        self._gather = operator.itemgetter(*self.backward)
+
+    def transform_packed(self, packed: str) -> str:
+        '''Returns the packed board moved by this symmetry.'''
+
+        return ''.join(self._gather(packed))
+
+    def transform_state(self, state: list) -> list:
+        '''Returns a board in the form of OthelloGame.state moved by this
+        symmetry.'''
+
+        return unpack_state(self.transform_packed(pack_state(state)),
+                            self.columns, self.rows)
+
+    def transform_move(self, move: tuple) -> tuple:
+        '''Returns where a (column, row) move goes under this symmetry.'''
+
+        square = self.forward[(move[1] - 1) * self.columns + move[0] - 1]
+        return (square % self.columns + 1, square // self.columns + 1)
+
+    def restore_move(self, move: tuple) -> tuple:
+        '''Returns the (column, row) move that this symmetry moved to move,
+        which maps a move on a canonical board back to the original.'''
+
+        square = self.backward[(move[1] - 1) * self.columns + move[0] - 1]
+        return (square % self.columns + 1, square // self.columns + 1)
+
+_transforms = {}
+
+def get_transforms(columns: int, rows: int) -> list:
+    '''Returns the list of Transforms for a board size, 8 for a square
+    board and 4 for a rectangular one, building them the first time the
+    size is used and sharing them after that. The first is the
+    identity.'''
+
+    transforms = _transforms.get((columns, rows))
+
+    if transforms is None:
+        othello._verify_board_size(columns, rows)
+        if columns == rows:
+            names = SYMMETRIES
+        else:
+            names = SYMMETRIES[:4]
+        transforms = [Transform(name, columns, rows) for name in names]
+        _transforms[(columns, rows)] = transforms
+
+    return transforms
+
+def pack_state(state: list) -> str:
+    '''Returns the packed string form of a board in the form of
+    OthelloGame.state.'''
+
+    columns = len(state)
+    return ''.join([state[square % columns][square // columns]
+                    for square in range(columns * len(state[0]))])
+
+def unpack_state(packed: str, columns: int, rows: int) -> list:
+    '''Returns the board in the form of OthelloGame.state for a packed
+    string.'''
+
+    return [list(packed[column::columns]) for column in range(columns)]
+
+def canonicalise_packed(packed: str, columns: int, rows: int) -> tuple:
+    '''Returns (canonical packed board, transform), where the canonical
+    board is the smallest of the boards the symmetries of the size move
+    packed to, and transform is the Transform that gives it. Use
+    transform.restore_move to map moves on the canonical board back.'''
+
+    best_packed = None
+    best_transform = None
+
+    for transform in get_transforms(columns, rows):
+        transformed = ''.join(transform._gather(packed))
+        if best_packed is None or transformed < best_packed:
+            best_packed = transformed
+            best_transform = transform
+
+    return (best_packed, best_transform)
+
+def canonicalise(state: list) -> tuple:
+    '''Returns (canonical board, transform) for a board in the form of
+    OthelloGame.state, in the same way as canonicalise_packed.'''
+
+    columns = len(state)
+    rows = len(state[0])
+    packed, transform = canonicalise_packed(pack_state(state), columns, rows)
+    return (unpack_state(packed, columns, rows), transform)
+
+def check_symmetries(columns: int, rows: int, seed: int = 0) -> None:
+    '''Checks the Transforms of a board size against a random game on it:
+    each transform must be undone by restore_move, every symmetric board
+    must have the same canonical form, and the possible moves of a
+    symmetric board must be the moved possible moves of the original.
+    Raises a SymmetryError describing the first problem found.'''
+
+    rng = random.Random(seed)
+    transforms = get_transforms(columns, rows)
+    game = othello.OthelloGame(columns, rows, 'BLACK', 'MOST', 'WHITE')
+    game.begin_game()
+
+    if len(transforms) != (8 if columns == rows else 4):
+        raise SymmetryError('{}x{}: {} transforms'.format(
+            columns, rows, len(transforms)))
+
+    while not game.check_if_game_over():
+        state = game.state
+        canonical = canonicalise(state)[0]
+        moves = set(game.get_possible_moves())
+        for transform in transforms:
+            for move in moves:
+                if transform.restore_move(transform.transform_move(move)) != move:
+                    raise SymmetryError('{}x{} {}: move {} not restored'.format(
+                        columns, rows, transform.name, move))
+            moved_state = transform.transform_state(state)
+            if canonicalise(moved_state)[0] != canonical:
+                raise SymmetryError('{}x{} {}: canonical form differs'.format(
+                    columns, rows, transform.name))
+            moved_moves = set(_return_game(moved_state, game.player_turn)
+                              .get_possible_moves())
+            if moved_moves != {transform.transform_move(move) for move in moves}:
+                raise SymmetryError('{}x{} {}: possible moves differ'.format(
+                    columns, rows, transform.name))
+        game.execute_move(rng.choice(sorted(moves)))
+
+def main() -> None:
+    '''Checks the symmetries of every board size _verify_board_size
+    accepts.'''
+
+    for columns in range(4, 17):
+        for rows in range(4, 17):
+            try:
+                check_symmetries(columns, rows)
+            except SymmetryError as error:
+                print('FAILED: ' + str(error), file = sys.stderr)
+                sys.exit(1)
+    print('all symmetries check out')
+
+
+#FUNCTIONS USED BY THE SYMMETRY CHECKS:
+
+def _return_game(state: list, player_turn: int) -> othello.OthelloGame:
+    '''Returns an OthelloGame with the tiles of a board in the form of
+    OthelloGame.state and player_turn to move.'''
+
+    game = othello.OthelloGame(len(state), len(state[0]), 'BLACK', 'MOST',
+                               'WHITE')
+    for column_index, column in enumerate(state):
+        for row_index, tile in enumerate(column):
+            if tile != othello.NONE:
+                game._place_tile((column_index + 1, row_index + 1), tile)
+    game.player_turn = player_turn
+    return game
+
+if __name__ == '__main__':
+
+    main()
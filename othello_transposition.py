@@ -0,0 +1,103 @@
+import sys
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+class TranspositionTable:
+    '''Fixed size table of search results keyed by othello.OthelloGame
+    position hashes. Each slot holds one entry, a tuple of
+    (hash, depth, bound, score, best move, generation). The table can be
+    shared by many searches; call new_search at the start of each one.'''
+
+    def __init__(self, size: int = 1 << 16):
+        '''Creates an empty TranspositionTable with room for size entries.
+        size is rounded up to a power of two.'''
+
+        slot_count = 1
+        while slot_count < size:
+            slot_count *= 2
+
+        self._mask = slot_count - 1
+        self._entries = [None] * slot_count
+        self.generation = 0
+        self.used = 0
+        self.clear_stats()
+
+    def new_search(self) -> None:
+        '''Marks the start of a new search, so entries stored by earlier
+        searches are replaced before entries from this one.'''
+
+        self.generation += 1
+
+    def lookup(self, position_hash: int) -> tuple:
+        '''Returns the entry stored for position_hash, or None if there
+        is no entry for it.'''
+
+        self.probes += 1
+        entry = self._entries[position_hash & self._mask]
+
+        if entry is not None and entry[0] == position_hash:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, position_hash: int, depth: int, bound: int, score: int,
+              move: tuple) -> None:
+        '''Stores a search result. An existing entry for a different
+        position is only replaced if it is from an earlier search or was
+        searched less deeply.'''
+
+        index = position_hash & self._mask
+        entry = self._entries[index]
+
+        if (entry is None or entry[0] == position_hash
+            or entry[5] != self.generation or entry[1] <= depth):
+            if entry is None:
+                self.used += 1
+            self.stores += 1
+            self._entries[index] = (position_hash, depth, bound, score, move,
+                                    self.generation)
+
+    def clear(self) -> None:
+        '''Removes every entry from the table.'''
+
+        self._entries = [None] * len(self._entries)
+        self.used = 0
+        self.clear_stats()
+
+    def clear_stats(self) -> None:
+        '''Resets the probe, hit and store counts.'''
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def get_stats(self) -> dict:
+        '''Returns a dictionary with the table's size, how many slots are
+        used, the number of probes, hits and stores, the hit rate and an
+        estimate of the memory used in bytes.'''
+
+        if self.probes > 0:
+            hit_rate = self.hits / self.probes
+        else:
+            hit_rate = 0.0
+
+        return {'size': len(self._entries), 'used': self.used,
+                'probes': self.probes, 'hits': self.hits,
+                'stores': self.stores, 'hit_rate': hit_rate,
+                'memory_bytes': self._return_memory_size()}
+
+    def _return_memory_size(self) -> int:
+        '''Returns an estimate of the memory used by the table in bytes.'''
+
+        memory_size = sys.getsizeof(self._entries)
+
+        for entry in self._entries:
+            if entry is not None:
+                memory_size += sys.getsizeof(entry)
+                memory_size += sys.getsizeof(entry[0])
+                if entry[4] is not None:
+                    memory_size += sys.getsizeof(entry[4])
+
+        return memory_size
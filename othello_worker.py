@@ -0,0 +1,117 @@
+import concurrent.futures
+import copy
+import queue
+import threading
+import othello_ai
+
+# Milliseconds between checks of the result queue while a job is running.
+POLL_INTERVAL = 50
+
+class AnalysisWorker:
+    '''Runs AI searches on a background thread so the tkinter mainloop
+    never blocks. Results are put on a queue which the tkinter thread
+    polls with root_window.after, so the callbacks always run on the
+    tkinter thread. Only one job runs at a time; submitting a new job or
+    calling cancel stops the current one and drops its results.'''
+
+    def __init__(self, root_window: 'tkinter.Tk'):
+        '''Creates an AnalysisWorker which polls for results on
+        root_window.'''
+
+        self.root_window = root_window
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+        self._results = queue.Queue()
+        self._job_id = 0
+        self._stop_event = None
+        self._on_progress = None
+        self._on_done = None
+        self._poll_id = None
+
+    def submit(self, game: 'OthelloGame', time_limit: float,
+               on_progress: 'function' = None,
+               on_done: 'function' = None) -> None:
+        '''Starts searching a copy of game for up to time_limit seconds.
+        on_progress is called with a dictionary of the best move so far,
+        its score, the depth reached and the node count after every
+        finished depth, and on_done is called with the chosen move.'''
+
+        self.cancel()
+
+        self._job_id += 1
+        self._stop_event = threading.Event()
+        self._on_progress = on_progress
+        self._on_done = on_done
+
+        self._executor.submit(_run_search, self._results, self._job_id,
+            copy.deepcopy(game), time_limit, self._stop_event)
+
+        if self._poll_id is None:
+            self._poll_id = self.root_window.after(POLL_INTERVAL, self._poll)
+
+    def cancel(self) -> None:
+        '''Stops the current job, if there is one. Any results it has not
+        yet delivered are dropped.'''
+
+        if self._stop_event is not None:
+            self._stop_event.set()
+            self._stop_event = None
+            self._job_id += 1
+
+    def is_busy(self) -> bool:
+        '''Returns True if a job is running.'''
+
+        return self._stop_event is not None
+
+    def shutdown(self) -> None:
+        '''Cancels the current job and stops the worker thread.'''
+
+        self.cancel()
+        if self._poll_id is not None:
+            self.root_window.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._executor.shutdown(wait = False)
+
+    def _poll(self) -> None:
+        '''Passes every queued result of the current job to its callbacks,
+        then polls again later while a job is running.'''
+
+        self._poll_id = None
+
+        while True:
+            try:
+                job_id, kind, result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if job_id != self._job_id:
+                continue
+            if kind == 'progress' and self._on_progress is not None:
+                self._on_progress(result)
+            if kind == 'done':
+                self._stop_event = None
+                if self._on_done is not None:
+                    self._on_done(result)
+            if kind == 'error':
+                self._stop_event = None
+                raise result
+
+        if self.is_busy():
+            self._poll_id = self.root_window.after(POLL_INTERVAL, self._poll)
+
+
+#FUNCTIONS USED BY THE ANALYSIS WORKER:
+
+def _run_search(results: queue.Queue, job_id: int, game: 'OthelloGame',
+                time_limit: float, stop_event: threading.Event) -> None:
+    '''Searches game on the worker thread, putting each finished depth
+    and then the chosen move on the results queue. An exception is put on
+    the queue so it is raised on the tkinter thread.'''
+
+    try:
+        player = othello_ai.AlphaBetaPlayer(time_limit)
+        move = player.choose_move(game,
+            on_depth = lambda progress: results.put((job_id, 'progress', progress)),
+            stop_event = stop_event)
+    except Exception as error:
+        results.put((job_id, 'error', error))
+    else:
+        results.put((job_id, 'done', move))